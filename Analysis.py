@@ -1,76 +1,266 @@
+"""
+Charts of the scraped player dataset.
+
+    python Analysis.py                                     # show the charts one by one
+    python Analysis.py --batch                             # render them to analysis_charts/
+    python Analysis.py --batch --by-tier --by-league --formats png,svg --workers 8
+
+The data every chart needs is queried once (see Query.py). In batch mode it is
+handed to a pool of worker processes, which render each chart - and with
+--by-tier/--by-league its variant for every tier or league - with the
+non-interactive Agg backend, so reports can be generated on a headless server.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-# Load data
-df = pd.read_csv("domestic_leagues_by_tier_20250527_230225.csv")
+from Dataset import compact_frame
+from Query import PlayerQueries
+
+# The partitioned Parquet output is preferred when it exists (python Scraper.py --parquet)
+DATA_PATH = "Football_Players_Data.parquet"
+if not os.path.exists(DATA_PATH):
+    DATA_PATH = "domestic_leagues_by_tier_20250527_230225.csv"
+
+# Only players with significant playing time (e.g., more than 5 full games)
+MIN_90S = 5
+
+# Everything the charts below read
+CHART_COLUMNS = ['League', 'Tier', 'Player', 'Team', 'Playing Time 90s', 'Performance Gls', 'Performance Ast',
+                 'Expected xG', 'Per 90 Minutes Gls', 'Per 90 Minutes Ast', 'Per 90 Minutes G+A']
 
-# Set plot style
-sns.set(style="whitegrid")
+DEFAULT_OUTPUT_DIR = "analysis_charts"
+DEFAULT_FORMATS = ['png']
+
+# Variant level -> the column its subsets are taken by
+VARIANT_COLUMNS = {'tier': 'Tier', 'league': 'League'}
+
+
+def load_chart_data(data_path=DATA_PATH):
+    """
+    The columns the charts use, for players with significant playing time, in one
+    query - compacted to categoricals and small numeric types, printing the savings
+    """
+    with PlayerQueries(data_path) as queries:
+        df = queries.select([col for col in CHART_COLUMNS if col in queries.columns], min_90s=MIN_90S)
+    return compact_frame(df, report=True)
 
-# Filter players with significant playing time (e.g., more than 5 full games)
-df_filtered = df[df['Playing Time 90s'] > 5]
 
 # 1. Top Goal Scorers
-top_scorers = df_filtered.sort_values('Performance Gls', ascending=False).head(20)
-plt.figure(figsize=(12, 8))
-sns.barplot(x='Performance Gls', y='Player', data=top_scorers, palette='rocket')
-plt.title("Top 20 Goal Scorers")
-plt.xlabel("Goals")
-plt.ylabel("Player")
-plt.tight_layout()
-plt.show()
+def top_scorers_chart(df, scope=""):
+    top_scorers = df.dropna(subset=['Performance Gls']).nlargest(20, 'Performance Gls')
+    fig = plt.figure(figsize=(12, 8))
+    sns.barplot(x='Performance Gls', y='Player', data=top_scorers, palette='rocket')
+    plt.title(f"Top 20 Goal Scorers{scope}")
+    plt.xlabel("Goals")
+    plt.ylabel("Player")
+    plt.tight_layout()
+    return fig
+
 
 # 2. Top Assist Providers
-top_assists = df_filtered.dropna(subset=['Performance Ast'])
-top_assists = top_assists.sort_values('Performance Ast', ascending=False).head(20)
-plt.figure(figsize=(12, 8))
-sns.barplot(x='Performance Ast', y='Player', data=top_assists, palette='crest')
-plt.title("Top 20 Assist Providers")
-plt.xlabel("Assists")
-plt.ylabel("Player")
-plt.tight_layout()
-plt.show()
+def top_assists_chart(df, scope=""):
+    top_assists = df.dropna(subset=['Performance Ast']).nlargest(20, 'Performance Ast')
+    fig = plt.figure(figsize=(12, 8))
+    sns.barplot(x='Performance Ast', y='Player', data=top_assists, palette='crest')
+    plt.title(f"Top 20 Assist Providers{scope}")
+    plt.xlabel("Assists")
+    plt.ylabel("Player")
+    plt.tight_layout()
+    return fig
+
 
 # 3. xG vs Actual Goals (Top scorers with xG data)
-xg_data = df_filtered.dropna(subset=['Expected xG'])
-top_xg = xg_data.sort_values('Performance Gls', ascending=False).head(30)
-plt.figure(figsize=(12, 8))
-sns.scatterplot(x='Expected xG', y='Performance Gls', hue='Player', data=top_xg, palette='tab20', legend=False)
-plt.plot([0, top_xg['Expected xG'].max()], [0, top_xg['Performance Gls'].max()], ls='--', c='gray')
-plt.title("Expected Goals (xG) vs Actual Goals")
-plt.xlabel("xG")
-plt.ylabel("Goals")
-plt.tight_layout()
-plt.show()
+def xg_vs_goals_chart(df, scope=""):
+    top_xg = df.dropna(subset=['Expected xG', 'Performance Gls']).nlargest(30, 'Performance Gls')
+    fig = plt.figure(figsize=(12, 8))
+    sns.scatterplot(x='Expected xG', y='Performance Gls', hue='Player', data=top_xg, palette='tab20', legend=False)
+    plt.plot([0, top_xg['Expected xG'].max()], [0, top_xg['Performance Gls'].max()], ls='--', c='gray')
+    plt.title(f"Expected Goals (xG) vs Actual Goals{scope}")
+    plt.xlabel("xG")
+    plt.ylabel("Goals")
+    plt.tight_layout()
+    return fig
+
 
 # 4. Distribution of Goals per 90 Minutes
-plt.figure(figsize=(10, 6))
-sns.histplot(df_filtered['Per 90 Minutes Gls'], bins=30, kde=True, color='darkblue')
-plt.title("Distribution of Goals per 90 Minutes")
-plt.xlabel("Goals per 90 Minutes")
-plt.ylabel("Player Count")
-plt.tight_layout()
-plt.show()
+def goals_per_90_chart(df, scope=""):
+    fig = plt.figure(figsize=(10, 6))
+    sns.histplot(df['Per 90 Minutes Gls'].dropna(), bins=30, kde=True, color='darkblue')
+    plt.title(f"Distribution of Goals per 90 Minutes{scope}")
+    plt.xlabel("Goals per 90 Minutes")
+    plt.ylabel("Player Count")
+    plt.tight_layout()
+    return fig
+
 
 # 5. Team Average Performance (G+A per 90)
-df_filtered['G+A/90'] = df_filtered['Per 90 Minutes G+A']
-team_avg = df_filtered.groupby('Team')['G+A/90'].mean().sort_values(ascending=False).head(15)
-plt.figure(figsize=(12, 8))
-sns.barplot(x=team_avg.values, y=team_avg.index, palette='mako')
-plt.title("Top 15 Teams by Average G+A per 90 Minutes")
-plt.xlabel("Average G+A per 90")
-plt.ylabel("Team")
-plt.tight_layout()
-plt.show()
+def team_average_chart(df, scope=""):
+    team_avg = df.groupby('Team', observed=True)['Per 90 Minutes G+A'].mean().sort_values(ascending=False).head(15)
+    fig = plt.figure(figsize=(12, 8))
+    # Plain team names, so the axis lists these 15 teams rather than every category
+    sns.barplot(x=team_avg.values, y=team_avg.index.astype(str), palette='mako')
+    plt.title(f"Top 15 Teams by Average G+A per 90 Minutes{scope}")
+    plt.xlabel("Average G+A per 90")
+    plt.ylabel("Team")
+    plt.tight_layout()
+    return fig
+
 
 # 6. Tier Comparison
-tier_avg = df_filtered.groupby('Tier')[['Per 90 Minutes Gls', 'Per 90 Minutes Ast']].mean().reset_index()
-tier_avg = pd.melt(tier_avg, id_vars='Tier', var_name='Metric', value_name='Value')
-plt.figure(figsize=(10, 6))
-sns.barplot(x='Tier', y='Value', hue='Metric', data=tier_avg, palette='viridis')
-plt.title("Average Goals and Assists per 90 by Tier")
-plt.ylabel("Average per 90 Minutes")
-plt.xlabel("Tier")
-plt.tight_layout()
-plt.show()
+def tier_comparison_chart(df, scope=""):
+    tier_avg = df.groupby('Tier', observed=True)[['Per 90 Minutes Gls', 'Per 90 Minutes Ast']].mean().reset_index()
+    tier_avg = pd.melt(tier_avg, id_vars='Tier', var_name='Metric', value_name='Value')
+    fig = plt.figure(figsize=(10, 6))
+    sns.barplot(x='Tier', y='Value', hue='Metric', data=tier_avg, palette='viridis')
+    plt.title(f"Average Goals and Assists per 90 by Tier{scope}")
+    plt.ylabel("Average per 90 Minutes")
+    plt.xlabel("Tier")
+    plt.tight_layout()
+    return fig
+
+
+# Chart name -> (drawing function, variant levels it is also drawn for)
+CHARTS = {
+    'top_scorers': (top_scorers_chart, ['tier', 'league']),
+    'top_assists': (top_assists_chart, ['tier', 'league']),
+    'xg_vs_goals': (xg_vs_goals_chart, ['tier', 'league']),
+    'goals_per_90': (goals_per_90_chart, ['tier', 'league']),
+    'team_average': (team_average_chart, ['tier', 'league']),
+    'tier_comparison': (tier_comparison_chart, []),
+}
+
+
+# Chart data of a worker process, set once by init_worker, and its subsets by level
+_DATA = None
+_SUBSETS = {}
+
+
+def init_worker(df):
+    """Keep the chart data in the worker, and draw without a display"""
+    global _DATA
+    plt.switch_backend('Agg')
+    sns.set(style="whitegrid")
+    _DATA = df
+    _SUBSETS.clear()
+
+
+def chart_subset(level, value):
+    """The rows of one tier or league, split off the shared data once per worker"""
+    if level is None:
+        return _DATA
+    if level not in _SUBSETS:
+        _SUBSETS[level] = dict(tuple(_DATA.groupby(VARIANT_COLUMNS[level], sort=False, observed=True)))
+    return _SUBSETS[level].get(value)
+
+
+def chart_path(output_dir, chart, level=None, value=None):
+    """analysis_charts/top_scorers or analysis_charts/League=Premier%20League/top_scorers (no extension)"""
+    if level is None:
+        return os.path.join(output_dir, chart)
+    return os.path.join(output_dir, f"{VARIANT_COLUMNS[level]}={quote(str(value), safe='')}", chart)
+
+
+def render_chart(chart, level, value, output_dir, formats):
+    """Draw one chart (variant) and save it in every format; returns the files written"""
+    df = chart_subset(level, value)
+    if df is None or df.empty:
+        return []
+
+    draw, _ = CHARTS[chart]
+    fig = draw(df, f" - {value}" if level else "")
+    path = chart_path(output_dir, chart, level, value)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    written = []
+    for fmt in formats:
+        fig.savefig(f"{path}.{fmt}", format=fmt)
+        written.append(f"{path}.{fmt}")
+    plt.close(fig)
+    return written
+
+
+def chart_jobs(df, charts, levels):
+    """(chart, level, value) of every chart and variant to render"""
+    jobs = [(chart, None, None) for chart in charts]
+    for level in levels:
+        values = sorted(df[VARIANT_COLUMNS[level]].dropna().unique())
+        jobs += [(chart, level, value) for chart in charts if level in CHARTS[chart][1] for value in values]
+    return jobs
+
+
+def render_batch(df, charts, levels, output_dir, formats, workers):
+    """Render every chart job on a process pool; returns the files written"""
+    jobs = chart_jobs(df, charts, levels)
+    print(f"🎨 Rendering {len(jobs)} charts as {', '.join(formats)} with {workers} worker(s) into {output_dir}/")
+
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(df,)) as pool:
+        futures = {pool.submit(render_chart, *job, output_dir, formats): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as e:
+                chart, level, value = futures[future]
+                print(f"❌ {chart}{f' ({value})' if level else ''} failed: {e}")
+    return written
+
+
+def show_charts(df, charts):
+    """The interactive mode: show each chart in turn"""
+    sns.set(style="whitegrid")
+    for chart in charts:
+        CHARTS[chart][0](df)
+        plt.show()
+
+
+def parse_charts(value):
+    charts = [chart.strip() for chart in value.split(',') if chart.strip()]
+    unknown = [chart for chart in charts if chart not in CHARTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown chart(s) {', '.join(unknown)}; choose from {', '.join(CHARTS)}")
+    return charts
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Charts of the scraped player dataset")
+    parser.add_argument("--data", default=DATA_PATH, help=f"Parquet directory or CSV file (default: {DATA_PATH})")
+    parser.add_argument("--charts", type=parse_charts, default=list(CHARTS),
+                        help=f"comma-separated charts to draw (default: all of {', '.join(CHARTS)})")
+    parser.add_argument("--batch", action="store_true",
+                        help="render to files on a process pool instead of showing the charts")
+    parser.add_argument("--by-tier", action="store_true", help="batch: also render every chart for each tier")
+    parser.add_argument("--by-league", action="store_true", help="batch: also render every chart for each league")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"batch: where to write the charts (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--formats", type=lambda value: [fmt.strip() for fmt in value.split(',') if fmt.strip()],
+                        default=DEFAULT_FORMATS, help="batch: comma-separated file formats, e.g. png,svg (default: png)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="batch: rendering processes (default: one per CPU)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    df = load_chart_data(args.data)
+
+    if not args.batch:
+        show_charts(df, args.charts)
+        return 0
+
+    start = time.perf_counter()
+    levels = [level for level, wanted in [('tier', args.by_tier), ('league', args.by_league)] if wanted]
+    written = render_batch(df, args.charts, levels, args.output_dir, args.formats, max(1, args.workers))
+    print(f"🖼️  Wrote {len(written)} files to {args.output_dir}/ in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
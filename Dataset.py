@@ -0,0 +1,586 @@
+import pandas as pd
+import csv
+import os
+import shutil
+import threading
+from collections import Counter
+from urllib.parse import quote, unquote
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for Parquet output
+    pa = None
+
+# Columns stored as text; every other column of the dataset is numeric
+TEXT_COLUMNS = ['League', 'Tier', 'Season', 'Player', 'Player ID', 'Nationality', 'Team', 'Pos', 'Age']
+
+# Text columns repeated across many player rows; held as categoricals in memory.
+# Player names and IDs are (nearly) unique per row and stay plain text
+CATEGORICAL_COLUMNS = ['League', 'Tier', 'Season', 'Team', 'Nationality', 'Pos']
+IDENTITY_TEXT_COLUMNS = ['Player', 'Player ID']
+
+# A player row is identified by the player and the team he played for in that table
+ROW_KEY_COLUMNS = ['Player ID', 'Team']
+
+# Player columns every FBRef stats category repeats; joined categories keep only the standard table's
+CATEGORY_SHARED_COLUMNS = ['League', 'Tier', 'Player', 'Player ID', 'Nationality', 'Team', 'Pos', 'Age', 'Born']
+
+# Hive-style partition columns of the Parquet dataset (Tier=.../League=.../part-0.parquet)
+PARTITION_COLUMNS = ['Tier', 'League']
+
+# Partition columns of the season archive (Season=.../Tier=.../League=....csv)
+SEASON_PARTITION_COLUMNS = ['Season', 'Tier', 'League']
+
+
+def _columns(group, dtype, unit, labels):
+    """Schema entries for the labels under one over-header group ("" for none)"""
+    return {f"{group} {label}".strip(): (dtype, unit) for label in labels}
+
+
+# Player columns of every FBRef stats table, under the dataset's names
+PLAYER_SCHEMA = {
+    'Player': ('text', 'name'),
+    'Nationality': ('text', 'country code'),
+    'Pos': ('text', 'position'),
+    'Team': ('text', 'name'),
+    'Age': ('text', 'years-days'),
+    'Born': ('int', 'year'),
+}
+
+# Declared schema of FBRef's player stats tables, by stats category: flattened
+# column name ("<over-header> <label>") -> (dtype, unit), with dtype 'text', 'int'
+# or 'float'. Stats that are counts but have gaps in a table stay float (NaN)
+FBREF_SCHEMA = {
+    'standard': {
+        **PLAYER_SCHEMA,
+        **_columns('Playing Time', 'int', 'matches', ['MP', 'Starts']),
+        **_columns('Playing Time', 'int', 'minutes', ['Min']),
+        **_columns('Playing Time', 'float', '90s', ['90s']),
+        **_columns('Performance', 'int', 'count', ['Gls', 'Ast', 'G+A', 'G-PK', 'PK', 'PKatt', 'CrdY', 'CrdR']),
+        **_columns('Expected', 'float', 'xg', ['xG', 'npxG', 'xAG', 'npxG+xAG']),
+        **_columns('Progression', 'int', 'count', ['PrgC', 'PrgP', 'PrgR']),
+        **_columns('Per 90 Minutes', 'float', 'per 90',
+                   ['Gls', 'Ast', 'G+A', 'G-PK', 'G+A-PK', 'xG', 'xAG', 'xG+xAG', 'npxG', 'npxG+xAG']),
+    },
+    'shooting': {
+        **PLAYER_SCHEMA,
+        **_columns('', 'float', '90s', ['90s']),
+        **_columns('Standard', 'int', 'count', ['Gls', 'Sh', 'SoT', 'FK', 'PK', 'PKatt']),
+        **_columns('Standard', 'float', 'percent', ['SoT%']),
+        **_columns('Standard', 'float', 'per 90', ['Sh/90', 'SoT/90']),
+        **_columns('Standard', 'float', 'ratio', ['G/Sh', 'G/SoT']),
+        **_columns('Standard', 'float', 'yards', ['Dist']),
+        **_columns('Expected', 'float', 'xg', ['xG', 'npxG', 'G-xG', 'np:G-xG']),
+        **_columns('Expected', 'float', 'ratio', ['npxG/Sh']),
+    },
+    'passing': {
+        **PLAYER_SCHEMA,
+        **_columns('', 'float', '90s', ['90s']),
+        **_columns('Total', 'int', 'count', ['Cmp', 'Att']),
+        **_columns('Total', 'float', 'percent', ['Cmp%']),
+        **_columns('Total', 'int', 'yards', ['TotDist', 'PrgDist']),
+        **{name: schema for group in ['Short', 'Medium', 'Long'] for name, schema in {
+            **_columns(group, 'int', 'count', ['Cmp', 'Att']),
+            **_columns(group, 'float', 'percent', ['Cmp%']),
+        }.items()},
+        **_columns('', 'int', 'count', ['Ast', 'KP', '1/3', 'PPA', 'CrsPA', 'PrgP']),
+        **_columns('', 'float', 'xg', ['xAG']),
+        **_columns('Expected', 'float', 'xg', ['xA', 'A-xAG']),
+    },
+    'gca': {
+        **PLAYER_SCHEMA,
+        **_columns('', 'float', '90s', ['90s']),
+        **_columns('SCA', 'int', 'count', ['SCA']),
+        **_columns('SCA', 'float', 'per 90', ['SCA90']),
+        **_columns('SCA Types', 'int', 'count', ['PassLive', 'PassDead', 'TO', 'Sh', 'Fld', 'Def']),
+        **_columns('GCA', 'int', 'count', ['GCA']),
+        **_columns('GCA', 'float', 'per 90', ['GCA90']),
+        **_columns('GCA Types', 'int', 'count', ['PassLive', 'PassDead', 'TO', 'Sh', 'Fld', 'Def']),
+    },
+    'defense': {
+        **PLAYER_SCHEMA,
+        **_columns('', 'float', '90s', ['90s']),
+        **_columns('Tackles', 'int', 'count', ['Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd']),
+        **_columns('Challenges', 'int', 'count', ['Tkl', 'Att', 'Lost']),
+        **_columns('Challenges', 'float', 'percent', ['Tkl%']),
+        **_columns('Blocks', 'int', 'count', ['Blocks', 'Sh', 'Pass']),
+        **_columns('', 'int', 'count', ['Int', 'Tkl+Int', 'Clr', 'Err']),
+    },
+    'possession': {
+        **PLAYER_SCHEMA,
+        **_columns('', 'float', '90s', ['90s']),
+        **_columns('Touches', 'int', 'count', ['Touches', 'Def Pen', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Att Pen', 'Live']),
+        **_columns('Take-Ons', 'int', 'count', ['Att', 'Succ', 'Tkld']),
+        **_columns('Take-Ons', 'float', 'percent', ['Succ%', 'Tkld%']),
+        **_columns('Carries', 'int', 'count', ['Carries', 'PrgC', '1/3', 'CPA', 'Mis', 'Dis']),
+        **_columns('Carries', 'int', 'yards', ['TotDist', 'PrgDist']),
+        **_columns('Receiving', 'int', 'count', ['Rec', 'PrgR']),
+    },
+    'keepers': {
+        **PLAYER_SCHEMA,
+        **_columns('Playing Time', 'int', 'matches', ['MP', 'Starts']),
+        **_columns('Playing Time', 'int', 'minutes', ['Min']),
+        **_columns('Playing Time', 'float', '90s', ['90s']),
+        **_columns('Performance', 'int', 'count', ['GA', 'SoTA', 'Saves', 'W', 'D', 'L', 'CS']),
+        **_columns('Performance', 'float', 'per 90', ['GA90']),
+        **_columns('Performance', 'float', 'percent', ['Save%', 'CS%']),
+        **_columns('Penalty Kicks', 'int', 'count', ['PKatt', 'PKA', 'PKsv', 'PKm']),
+        **_columns('Penalty Kicks', 'float', 'percent', ['Save%']),
+    },
+}
+
+# Columns the scraper adds to every table; never reported as unknown
+DATASET_COLUMNS = ['League', 'Tier', 'Season', 'Player ID']
+
+
+def _to_numbers(values):
+    """Vectorized text -> number conversion: thousands separators and % signs are dropped, blanks become NaN"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values, 0
+    text = values.astype('string').str.strip().str.replace(',', '', regex=False).str.rstrip('%')
+    text = text.mask(text == '')
+    numbers = pd.to_numeric(text, errors='coerce').astype('float64')
+    return numbers, int((numbers.isna() & text.notna()).sum())
+
+
+def apply_schema(df, category='standard'):
+    """
+    Coerce a stats table to its declared FBREF_SCHEMA types, one vectorized
+    conversion per column ("1,234" -> 1234). Declared numbers that don't parse
+    become NaN and are counted as invalid; 'int' columns without gaps are stored
+    as int64. Columns the schema doesn't know are only converted when every value
+    is a number. Returns (frame, report) where the report lists the 'unknown' and
+    'missing' columns and the 'invalid' value count per column.
+    """
+    schema = FBREF_SCHEMA[category]
+    df = df.copy()
+    report = {'unknown': [], 'missing': [col for col in schema if col not in df.columns], 'invalid': {}}
+
+    for col in df.columns:
+        if col in DATASET_COLUMNS:
+            continue
+
+        if col not in schema:
+            report['unknown'].append(col)
+            numbers, invalid = _to_numbers(df[col])
+            if not invalid:
+                df[col] = numbers
+            continue
+
+        dtype, _ = schema[col]
+        if dtype == 'text':
+            continue
+        numbers, invalid = _to_numbers(df[col])
+        if invalid:
+            report['invalid'][col] = invalid
+        if dtype == 'int' and numbers.notna().all() and (numbers % 1 == 0).all():
+            numbers = numbers.astype('int64')
+        df[col] = numbers
+
+    return df, report
+
+
+def describe_schema_report(report):
+    """One line summarising a schema report, or None when the table matched its schema"""
+    parts = []
+    if report['unknown']:
+        parts.append(f"{len(report['unknown'])} unknown columns ({', '.join(report['unknown'])})")
+    if report['missing']:
+        parts.append(f"{len(report['missing'])} missing columns ({', '.join(report['missing'])})")
+    if report['invalid']:
+        parts.append("non-numeric values in " + ', '.join(f"{col} ({count})" for col, count in report['invalid'].items()))
+    return '; '.join(parts) or None
+
+
+def flatten_columns(df):
+    """Join MultiIndex column levels into single names ("Performance" + "Gls" -> "Performance Gls")"""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = [' '.join(str(level) for level in col).strip() for col in df.columns.values]
+    return df
+
+
+def _columns_named(df, label):
+    """Columns whose label (the last word of the flattened name) is `label`"""
+    return [col for col in df.columns if str(col).split(' ')[-1] == label]
+
+
+def clean_league_frame(df):
+    """
+    Column-wise cleaning stage shared by every FBRef table scraper.
+
+    - flattens MultiIndex headers
+    - removes the header rows FBRef repeats inside long tables, recognised by the
+      rank or player column holding its own label ("Rk" / "Player")
+    - drops 'Unnamed' columns, the rank column and the trailing match-log column
+
+    Every step is a vectorized comparison on a handful of columns, so real players
+    whose name or team happens to contain "Age" or "Nation" are left alone.
+    """
+    df = flatten_columns(df)
+
+    header_mask = pd.Series(False, index=df.index)
+    for label in ['Rk', 'Player']:
+        for col in _columns_named(df, label):
+            header_mask |= df[col].astype(str).str.strip().eq(label)
+    if header_mask.any():
+        df = df[~header_mask].reset_index(drop=True)
+
+    drop = [col for col in df.columns if str(col).startswith('Unnamed')]
+    drop += _columns_named(df, 'Rk') + _columns_named(df, 'Matches')
+    identity = {'League', 'Tier', 'Player', 'Player ID', 'Nationality', 'Team'}
+    drop = [col for col in dict.fromkeys(drop) if col not in identity]
+
+    return df.drop(columns=drop)
+
+
+def row_keys(df):
+    """
+    Stable key of every player row: FBRef's player ID (the name for rows that have
+    none) plus the team, since a player who moved within a league has a row per club
+    """
+    ids = df['Player ID'] if 'Player ID' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    player = ids.where(ids.notna() & (ids.astype(str) != ''), 'name:' + df['Player'].astype(str))
+    team = df['Team'].astype(str) if 'Team' in df.columns else ''
+    return player.astype(str) + '|' + team
+
+
+def upsert_rows(stored, fresh):
+    """
+    Merge a fresh scrape of a league into its stored rows, keyed by row_keys().
+    Fresh rows that are new are appended and fresh rows whose values differ replace
+    the stored row in place; stored rows are otherwise left untouched, including
+    players missing from the fresh table. Both frames must have been read the same
+    way (e.g. both from CSV) so that equal values compare equal.
+
+    Returns (merged frame, rows added, rows changed).
+    """
+    columns = list(stored.columns) + [col for col in fresh.columns if col not in stored.columns]
+    stored = stored.reindex(columns=columns).set_axis(row_keys(stored), axis=0)
+    fresh = fresh.reindex(columns=columns).set_axis(row_keys(fresh), axis=0)
+    stored = stored[~stored.index.duplicated(keep='last')]
+    fresh = fresh[~fresh.index.duplicated(keep='last')]
+
+    common = fresh.index.intersection(stored.index, sort=False)
+    old, new = stored.loc[common], fresh.loc[common]
+    same = (old == new) | (old.isna() & new.isna())
+    changed = common[~same.all(axis=1).to_numpy()]
+    added = fresh.index.difference(stored.index, sort=False)
+
+    merged = pd.concat([stored[~stored.index.isin(changed)], fresh.loc[changed]]).loc[stored.index]
+    merged = pd.concat([merged, fresh.loc[added]])
+    return merged.reset_index(drop=True), len(added), len(changed)
+
+
+def join_categories(base, extras):
+    """
+    Join the tables of other stats categories onto a league's standard stats, one
+    wide row per player-team stint. `extras` maps a column prefix to a category
+    table; its player columns are dropped and the rest prefixed ("Shooting" +
+    "Standard Sh" -> "Shooting Standard Sh"). Rows are matched on row_keys() with
+    one reindex per category, so players missing from a category (outfielders in
+    the keepers table) get empty cells and extra rows are ignored.
+    """
+    keys = row_keys(base)
+    joined = [base]
+    for prefix, frame in extras.items():
+        stats = frame.drop(columns=[col for col in CATEGORY_SHARED_COLUMNS if col in frame.columns])
+        stats = stats.set_axis(row_keys(frame), axis=0)
+        stats = stats[~stats.index.duplicated(keep='first')].reindex(keys)
+        stats.columns = [f"{prefix} {col}" for col in stats.columns]
+        joined.append(stats.set_axis(base.index, axis=0))
+    return pd.concat(joined, axis=1) if len(joined) > 1 else base
+
+
+class DatasetWriter:
+    """
+    Streaming sink for the combined dataset: each league is appended to disk as it
+    arrives, so memory stays flat however many leagues are scraped.
+
+    Stat columns differ between leagues, so the column list grows as new ones show
+    up; new columns are always added at the end, which means every row already on
+    disk holds a prefix of the final columns. close() pads those rows in one
+    streaming pass and moves the file into place. Row counts per tier, league and
+    nationality are kept incrementally for the run summary.
+    """
+
+    SAMPLE_COLUMNS = ['League', 'Tier', 'Player', 'Team', 'Nationality']
+
+    def __init__(self, path, encoding='utf-8-sig'):
+        self.path = path
+        self.encoding = encoding
+        self.partial_path = f"{path}.partial"
+        self.columns = []
+        self.rows = 0
+        self.tier_counts = Counter()
+        self.league_counts = Counter()
+        self.nationality_counts = Counter()
+        self.sample = []
+        self._columns_on_disk = None
+        self._lock = threading.Lock()
+        self._file = open(self.partial_path, 'w', encoding=encoding, newline='')
+
+    def append(self, df):
+        """Write one league's rows and update the running counts"""
+        with self._lock:
+            self.columns += [col for col in df.columns if col not in self.columns]
+
+            write_header = self._columns_on_disk is None
+            if write_header:
+                self._columns_on_disk = list(self.columns)
+
+            df.reindex(columns=self.columns).to_csv(self._file, header=write_header, index=False)
+            self._file.flush()
+
+            self.rows += len(df)
+            for counts, col in [(self.tier_counts, 'Tier'), (self.league_counts, 'League'),
+                                (self.nationality_counts, 'Nationality')]:
+                if col in df.columns:
+                    counts.update(df[col].value_counts().to_dict())
+
+            if len(self.sample) < 15:
+                sample_cols = [col for col in self.SAMPLE_COLUMNS if col in df.columns]
+                self.sample += df[sample_cols].head(15 - len(self.sample)).to_dict('records')
+
+    def close(self):
+        """Finish the file: pad early rows if columns were added later, then rename into place"""
+        with self._lock:
+            self._file.close()
+
+            if self._columns_on_disk is None or self._columns_on_disk == self.columns:
+                os.replace(self.partial_path, self.path)
+                return
+
+            tmp_path = f"{self.path}.tmp"
+            with open(self.partial_path, 'r', encoding=self.encoding, newline='') as src, \
+                    open(tmp_path, 'w', encoding=self.encoding, newline='') as dst:
+                reader = csv.reader(src)
+                writer = csv.writer(dst)
+                next(reader)
+                writer.writerow(self.columns)
+                width = len(self.columns)
+                for row in reader:
+                    writer.writerow(row + [''] * (width - len(row)))
+
+            os.replace(tmp_path, self.path)
+            os.remove(self.partial_path)
+
+
+def arrow_schema(columns):
+    """Explicit Arrow schema for dataset columns: text columns as strings, stats as float64"""
+    return pa.schema([(col, pa.string() if col in TEXT_COLUMNS else pa.float64()) for col in columns])
+
+
+def to_arrow_table(df, schema):
+    """Convert a league frame to `schema`, coercing stat columns that came through as text"""
+    df = df.copy()
+    for field in schema:
+        if field.name not in df.columns:
+            df[field.name] = None
+        elif pa.types.is_string(field.type):
+            df[field.name] = df[field.name].astype('string')
+        else:
+            df[field.name] = pd.to_numeric(df[field.name], errors='coerce').astype('float64')
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
+class ParquetDatasetWriter:
+    """
+    Streaming sink writing the dataset as Parquet, partitioned by Tier and League
+    (<root>/Tier=Tier 1/League=Premier League/part-0.parquet), with text columns as
+    strings and every stat as float64. Readers can then load just the columns and
+    partitions they need. Each league is written when it arrives; close() stores the
+    union schema of all leagues in <root>/_common_metadata and moves the dataset
+    into place, replacing the previous one.
+    """
+
+    def __init__(self, root):
+        if pa is None:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+
+        self.root = root
+        self.partial_root = f"{root}.partial"
+        self.columns = []
+        self._parts = Counter()
+        self._lock = threading.Lock()
+
+        shutil.rmtree(self.partial_root, ignore_errors=True)
+        os.makedirs(self.partial_root)
+
+    def append(self, df):
+        """Write one league's rows into its Tier/League partition(s)"""
+        with self._lock:
+            self.columns += [col for col in df.columns
+                             if col not in self.columns and col not in PARTITION_COLUMNS]
+
+            for (tier, league), part in df.groupby(PARTITION_COLUMNS, sort=False):
+                partition = os.path.join(self.partial_root,
+                                         f"Tier={quote(str(tier), safe='')}",
+                                         f"League={quote(str(league), safe='')}")
+                os.makedirs(partition, exist_ok=True)
+
+                data_columns = [col for col in part.columns if col not in PARTITION_COLUMNS]
+                table = to_arrow_table(part[data_columns], arrow_schema(data_columns))
+                pq.write_table(table, os.path.join(partition, f"part-{self._parts[partition]}.parquet"))
+                self._parts[partition] += 1
+
+    def close(self):
+        with self._lock:
+            pq.write_metadata(arrow_schema(self.columns), os.path.join(self.partial_root, '_common_metadata'))
+            shutil.rmtree(self.root, ignore_errors=True)
+            os.replace(self.partial_root, self.root)
+
+
+class SeasonArchive:
+    """
+    Store of completed seasons, partitioned by season: one CSV per league-season at
+    <root>/Season=2023-2024/Tier=Tier 1/League=Premier League.csv. A finished season
+    never changes, so every file is written once, atomically, and never replaced;
+    a backfill skips the league-seasons the archive already has. Works as a dataset
+    sink for rows carrying a Season column.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def path(self, season, tier, league):
+        return os.path.join(self.root, *[f"{col}={quote(str(value), safe='')}" for col, value in
+                                         zip(SEASON_PARTITION_COLUMNS, [season, tier, league])]) + '.csv'
+
+    def has(self, season, tier, league):
+        return os.path.exists(self.path(season, tier, league))
+
+    def append(self, df):
+        """Write each league-season of `df` that isn't archived yet"""
+        for (season, tier, league), part in df.groupby(SEASON_PARTITION_COLUMNS, sort=False):
+            path = self.path(season, tier, league)
+            with self._lock:
+                if os.path.exists(path):
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                part.to_csv(tmp_path, index=False, encoding='utf-8')
+                os.replace(tmp_path, path)
+                self.written += 1
+
+    def close(self):
+        pass
+
+
+def _format_bytes(size):
+    for unit in ['B', 'KiB', 'MiB']:
+        if size < 1024:
+            return f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GiB"
+
+
+def compact_frame(df, report=False, category_ratio=0.5):
+    """
+    Shrink a dataset frame in memory. CATEGORICAL_COLUMNS, and any other text column
+    with fewer distinct values than `category_ratio` of its rows, become categoricals;
+    player names and IDs stay plain text. Whole-number stats without gaps get the
+    smallest integer type that holds them, and every other stat becomes float32.
+    With `report` the memory used before and after is printed, with the biggest savings.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in IDENTITY_TEXT_COLUMNS:
+            pass
+        elif col in TEXT_COLUMNS or not pd.api.types.is_numeric_dtype(values):
+            if col in CATEGORICAL_COLUMNS or values.nunique(dropna=True) < category_ratio * len(values):
+                values = values.astype('category')
+        elif pd.api.types.is_bool_dtype(values):
+            pass
+        elif pd.api.types.is_numeric_dtype(values):
+            present = values.dropna()
+            if len(present) == len(values) and (present % 1 == 0).all():
+                values = pd.to_numeric(values, downcast='integer')
+            else:
+                values = values.astype('float32')
+        columns[col] = values
+    compact = pd.DataFrame(columns, index=df.index)
+
+    if report:
+        before = df.memory_usage(deep=True, index=False)
+        after = compact.memory_usage(deep=True, index=False)
+        print(f"🗜️  Dataset memory: {_format_bytes(before.sum())} -> {_format_bytes(after.sum())} "
+              f"({1 - after.sum() / before.sum():.0%} smaller; {len(df):,} rows x {len(df.columns)} columns)"
+              if before.sum() else "🗜️  Dataset is empty")
+        for col in (before - after).sort_values(ascending=False).head(5).index:
+            print(f"   {col}: {df[col].dtype} -> {compact[col].dtype}, "
+                  f"{_format_bytes(before[col])} -> {_format_bytes(after[col])}")
+
+    return compact
+
+
+def load_seasons(root, seasons=None, tiers=None, leagues=None, compact=True, report=False):
+    """
+    Load league-seasons from a season archive. Partitions outside `seasons`, `tiers`
+    or `leagues` are skipped by their path, without being opened. The frame is
+    compacted (see compact_frame) unless `compact` is False.
+    """
+    wanted = dict(zip(SEASON_PARTITION_COLUMNS, [seasons, tiers, leagues]))
+    frames = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if not filename.endswith('.csv'):
+                continue
+            path = os.path.join(dirpath, filename)
+            parts = os.path.relpath(path, root)[:-len('.csv')].split(os.sep)
+            values = dict(unquote(part).split('=', 1) for part in parts)
+            if any(allowed is not None and values.get(col) not in allowed for col, allowed in wanted.items()):
+                continue
+            frames.append(pd.read_csv(path, encoding='utf-8', dtype={col: str for col in TEXT_COLUMNS}))
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return compact_frame(df, report) if compact else df
+
+
+def dataset_columns(path):
+    """Column names of the dataset at `path` (Parquet directory or CSV file), without reading its rows"""
+    if not os.path.isdir(path):
+        return list(pd.read_csv(path, encoding='utf-8-sig', nrows=0).columns)
+    if pa is None:
+        raise SystemExit("Reading the Parquet dataset needs pyarrow: pip install pyarrow")
+    return pq.read_schema(os.path.join(path, '_common_metadata')).names + PARTITION_COLUMNS
+
+
+def load_dataset(path, columns=None, tiers=None, leagues=None, compact=True, report=False):
+    """
+    Load the player dataset from the partitioned Parquet directory or a CSV file.
+    With Parquet only the requested columns are read and partitions outside
+    `tiers`/`leagues` are skipped without being opened. The frame is compacted
+    (see compact_frame) unless `compact` is False; `report` prints its memory use.
+    """
+    if not os.path.isdir(path):
+        df = pd.read_csv(path, encoding='utf-8-sig', usecols=columns, dtype={col: str for col in TEXT_COLUMNS})
+        if tiers is not None:
+            df = df[df['Tier'].isin(tiers)]
+        if leagues is not None:
+            df = df[df['League'].isin(leagues)]
+        df = df.reset_index(drop=True)
+        return compact_frame(df, report) if compact else df
+
+    if pa is None:
+        raise SystemExit("Reading the Parquet dataset needs pyarrow: pip install pyarrow")
+
+    file_schema = pq.read_schema(os.path.join(path, '_common_metadata'))
+    partitioning = ds.partitioning(pa.schema([(col, pa.string()) for col in PARTITION_COLUMNS]), flavor='hive')
+    schema = pa.unify_schemas([file_schema, partitioning.schema])
+    dataset = ds.dataset(path, format='parquet', schema=schema, partitioning=partitioning,
+                         exclude_invalid_files=True)
+
+    expression = None
+    for col, values in [('Tier', tiers), ('League', leagues)]:
+        if values is not None:
+            condition = ds.field(col).isin(list(values))
+            expression = condition if expression is None else expression & condition
+
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    return compact_frame(df, report) if compact else df
@@ -0,0 +1,338 @@
+"""
+Links the FBRef players of the scraped dataset to their Transfermarkt profiles
+(TransfrMarkt-Failed Version/PLAYERS_DATA.csv), so market values can be joined
+onto performance stats.
+
+The two sources share no key, and comparing every pair of names would take 35k x
+35k comparisons. Instead names are normalized (accents, non-breaking and zero-width
+spaces, as in PLAYERS_DATA-cleaner.py) and split into words, and only pairs that
+share a name word *and* either a word of their team or their nationality and age
+(+/- 1 year) are compared. Those candidate pairs are scored with table joins and
+array arithmetic - no per-pair Python - and each player keeps its best profile:
+
+    score = 0.55 * name + 0.20 * team + 0.15 * nationality + 0.10 * age
+
+where `name` is the share of the FBRef name's words found in the Transfermarkt
+full name or profile URL, and the others are 1 when they agree. The result is a
+crosswalk table, saved as CSV:
+
+    python Linker.py
+    python Linker.py --fbref Football_Players_Data.parquet --joined players_with_values.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from Dataset import dataset_columns, load_dataset
+
+DEFAULT_FBREF_PATH = "Football_Players_Data.csv"
+DEFAULT_TRANSFERMARKT_PATH = os.path.join("TransfrMarkt-Failed Version", "PLAYERS_DATA.csv")
+DEFAULT_CROSSWALK_PATH = "fbref_transfermarkt_crosswalk.csv"
+
+FBREF_COLUMNS = ['Player', 'Player ID', 'Nationality', 'Team', 'Age']
+
+# Weights of the agreeing fields, and what a pair needs to be linked
+WEIGHTS = {'name': 0.55, 'team': 0.20, 'nationality': 0.15, 'age': 0.10}
+MIN_NAME_SCORE = 0.5
+MIN_SCORE = 0.7
+
+# Words too common to tell names or clubs apart
+NAME_PARTICLES = {'de', 'da', 'do', 'dos', 'das', 'del', 'della', 'di', 'van', 'von', 'der', 'den', 'le', 'la',
+                  'el', 'al', 'bin', 'ben', 'junior', 'jr'}
+CLUB_WORDS = {'fc', 'cf', 'afc', 'sc', 'ac', 'as', 'ss', 'sv', 'fk', 'sk', 'cd', 'ud', 'rc', 'rcd', 'club', 'calcio',
+              'football', 'futbol', 'clube', 'sport', 'sports', 'sporting', 'real', 'atletico', 'athletic',
+              'united', 'utd', 'city', 'town', 'county', 'rovers', 'wanderers', 'ii', 'iii', 'b', 'u', 'de', 'del'}
+
+# Letters that Unicode decomposition doesn't reduce to ASCII
+TRANSLITERATION = str.maketrans({'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE', 'ß': 'ss',
+                                 'ł': 'l', 'Ł': 'L', 'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D', 'þ': 'th',
+                                 'Þ': 'Th', 'ı': 'i', 'ħ': 'h', 'Ħ': 'H'})
+
+# Transfermarkt country names -> the FIFA codes FBRef shows as nationality
+COUNTRY_CODES = {
+    'Afghanistan': 'AFG', 'Albania': 'ALB', 'Algeria': 'ALG', 'American Samoa': 'ASA', 'Andorra': 'AND',
+    'Angola': 'ANG', 'Anguilla': 'AIA', 'Antigua and Barbuda': 'ATG', 'Argentina': 'ARG', 'Armenia': 'ARM',
+    'Aruba': 'ARU', 'Australia': 'AUS', 'Austria': 'AUT', 'Azerbaijan': 'AZE', 'Bahamas': 'BAH',
+    'Bahrain': 'BHR', 'Bangladesh': 'BAN', 'Barbados': 'BRB', 'Belarus': 'BLR', 'Belgium': 'BEL',
+    'Belize': 'BLZ', 'Benin': 'BEN', 'Bermuda': 'BER', 'Bhutan': 'BHU', 'Bolivia': 'BOL',
+    'Bosnia-Herzegovina': 'BIH', 'Bosnia and Herzegovina': 'BIH', 'Botswana': 'BOT', 'Brazil': 'BRA',
+    'British Virgin Islands': 'VGB', 'Brunei Darussalam': 'BRU', 'Bulgaria': 'BUL', 'Burkina Faso': 'BFA',
+    'Burundi': 'BDI', 'Cambodia': 'CAM', 'Cameroon': 'CMR', 'Canada': 'CAN', 'Cape Verde': 'CPV',
+    'Cayman Islands': 'CAY', 'Central African Republic': 'CTA', 'Chad': 'CHA', 'Chile': 'CHI', 'China': 'CHN',
+    'Chinese Taipei': 'TPE', 'Colombia': 'COL', 'Comoros': 'COM', 'Congo': 'CGO', 'DR Congo': 'COD',
+    'Cook Islands': 'COK', 'Costa Rica': 'CRC', "Cote d'Ivoire": 'CIV', 'Ivory Coast': 'CIV', 'Croatia': 'CRO',
+    'Cuba': 'CUB', 'Curacao': 'CUW', 'Cyprus': 'CYP', 'Czech Republic': 'CZE', 'Czechia': 'CZE',
+    'Denmark': 'DEN', 'Djibouti': 'DJI', 'Dominica': 'DMA', 'Dominican Republic': 'DOM', 'Ecuador': 'ECU',
+    'Egypt': 'EGY', 'El Salvador': 'SLV', 'England': 'ENG', 'Equatorial Guinea': 'EQG', 'Eritrea': 'ERI',
+    'Estonia': 'EST', 'Eswatini': 'SWZ', 'Ethiopia': 'ETH', 'Faroe Islands': 'FRO', 'Fiji': 'FIJ',
+    'Finland': 'FIN', 'France': 'FRA', 'French Guiana': 'GUF', 'Gabon': 'GAB', 'The Gambia': 'GAM',
+    'Gambia': 'GAM', 'Georgia': 'GEO', 'Germany': 'GER', 'Ghana': 'GHA', 'Gibraltar': 'GIB', 'Greece': 'GRE',
+    'Grenada': 'GRN', 'Guadeloupe': 'GLP', 'Guam': 'GUM', 'Guatemala': 'GUA', 'Guinea': 'GUI',
+    'Guinea-Bissau': 'GNB', 'Guyana': 'GUY', 'Haiti': 'HAI', 'Honduras': 'HON', 'Hongkong': 'HKG',
+    'Hong Kong': 'HKG', 'Hungary': 'HUN', 'Iceland': 'ISL', 'India': 'IND', 'Indonesia': 'IDN', 'Iran': 'IRN',
+    'Iraq': 'IRQ', 'Ireland': 'IRL', 'Israel': 'ISR', 'Italy': 'ITA', 'Jamaica': 'JAM', 'Japan': 'JPN',
+    'Jordan': 'JOR', 'Kazakhstan': 'KAZ', 'Kenya': 'KEN', 'Kosovo': 'KVX', 'Kuwait': 'KUW',
+    'Kyrgyzstan': 'KGZ', 'Laos': 'LAO', 'Latvia': 'LVA', 'Lebanon': 'LBN', 'Lesotho': 'LES', 'Liberia': 'LBR',
+    'Libya': 'LBY', 'Liechtenstein': 'LIE', 'Lithuania': 'LTU', 'Luxembourg': 'LUX', 'Macao': 'MAC',
+    'Madagascar': 'MAD', 'Malawi': 'MWI', 'Malaysia': 'MAS', 'Maldives': 'MDV', 'Mali': 'MLI', 'Malta': 'MLT',
+    'Martinique': 'MTQ', 'Mauritania': 'MTN', 'Mauritius': 'MRI', 'Mexico': 'MEX', 'Moldova': 'MDA',
+    'Mongolia': 'MNG', 'Montenegro': 'MNE', 'Montserrat': 'MSR', 'Morocco': 'MAR', 'Mozambique': 'MOZ',
+    'Myanmar': 'MYA', 'Namibia': 'NAM', 'Nepal': 'NEP', 'Netherlands': 'NED', 'New Caledonia': 'NCL',
+    'New Zealand': 'NZL', 'Nicaragua': 'NCA', 'Niger': 'NIG', 'Nigeria': 'NGA', 'Korea, North': 'PRK',
+    'North Korea': 'PRK', 'North Macedonia': 'MKD', 'Northern Ireland': 'NIR', 'Norway': 'NOR', 'Oman': 'OMA',
+    'Pakistan': 'PAK', 'Palestine': 'PLE', 'Panama': 'PAN', 'Papua New Guinea': 'PNG', 'Paraguay': 'PAR',
+    'Peru': 'PER', 'Philippines': 'PHI', 'Poland': 'POL', 'Portugal': 'POR', 'Puerto Rico': 'PUR',
+    'Qatar': 'QAT', 'Romania': 'ROU', 'Russia': 'RUS', 'Rwanda': 'RWA', 'St. Kitts & Nevis': 'SKN',
+    'St. Lucia': 'LCA', 'St. Vincent & Grenadinen': 'VIN', 'Samoa': 'SAM', 'San Marino': 'SMR',
+    'Sao Tome and Principe': 'STP', 'Saudi Arabia': 'KSA', 'Scotland': 'SCO', 'Senegal': 'SEN',
+    'Serbia': 'SRB', 'Seychelles': 'SEY', 'Sierra Leone': 'SLE', 'Singapore': 'SIN', 'Slovakia': 'SVK',
+    'Slovenia': 'SVN', 'Solomon Islands': 'SOL', 'Somalia': 'SOM', 'South Africa': 'RSA',
+    'Korea, South': 'KOR', 'South Korea': 'KOR', 'South Sudan': 'SSD', 'Spain': 'ESP', 'Sri Lanka': 'SRI',
+    'Sudan': 'SDN', 'Suriname': 'SUR', 'Sweden': 'SWE', 'Switzerland': 'SUI', 'Syria': 'SYR', 'Tahiti': 'TAH',
+    'Tajikistan': 'TJK', 'Tanzania': 'TAN', 'Thailand': 'THA', 'Timor-Leste': 'TLS', 'Togo': 'TOG',
+    'Tonga': 'TGA', 'Trinidad and Tobago': 'TRI', 'Tunisia': 'TUN', 'Türkiye': 'TUR', 'Turkey': 'TUR',
+    'Turkmenistan': 'TKM', 'Uganda': 'UGA', 'Ukraine': 'UKR', 'United Arab Emirates': 'UAE',
+    'United States': 'USA', 'Uruguay': 'URU', 'Uzbekistan': 'UZB', 'Vanuatu': 'VAN', 'Venezuela': 'VEN',
+    'Vietnam': 'VIE', 'Wales': 'WAL', 'Yemen': 'YEM', 'Zambia': 'ZAM', 'Zimbabwe': 'ZIM',
+}
+
+
+def normalize_text(values):
+    """
+    Lower-case ASCII words of a Series of names: non-breaking and zero-width spaces
+    removed, accents stripped ("Ødegaard" -> "odegaard") and punctuation turned into spaces
+    """
+    text = values.fillna('').astype(str).str.replace('\xa0', ' ', regex=False).str.replace('\u200b', '', regex=False)
+    text = text.str.translate(TRANSLITERATION).str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    return text.str.lower().str.replace(r"[^a-z]+", ' ', regex=True).str.strip()
+
+
+COUNTRY_LOOKUP = dict(zip(normalize_text(pd.Series(list(COUNTRY_CODES))), COUNTRY_CODES.values()))
+
+
+def word_table(keys, values, stop_words, min_length=2):
+    """(key, word) rows for every distinct useful word of each value"""
+    words = pd.DataFrame({'key': keys, 'word': normalize_text(pd.Series(values, index=keys)).str.split().values})
+    words = words.explode('word').dropna()
+    words = words[(words['word'].str.len() >= min_length) & ~words['word'].isin(stop_words)]
+    return words.drop_duplicates().reset_index(drop=True)
+
+
+def parse_market_value(values):
+    """Transfermarkt market values like "€20.00m" or "€400k" -> euros (NaN when unknown)"""
+    parts = values.astype(str).str.replace(',', '', regex=False).str.extract(r'([\d.]+)\s*(bn|m|k|Th\.)?', expand=True)
+    amounts = pd.to_numeric(parts[0], errors='coerce')
+    return amounts * parts[1].map({'bn': 1e9, 'm': 1e6, 'k': 1e3, 'Th.': 1e3}).fillna(1.0)
+
+
+def fbref_keys(df):
+    """Key of each FBRef row's player: the player ID, or 'name:<Player>' for rows without one"""
+    if 'Player ID' not in df:
+        # Datasets scraped before player IDs were kept
+        return 'name:' + df['Player'].astype(str)
+    ids = df['Player ID'].astype('string')
+    return ids.where(ids.notna() & (ids != ''), 'name:' + df['Player'].astype(str)).astype(str)
+
+
+def fbref_players(df):
+    """One row per FBRef player (by player ID, else name), with all their teams"""
+    key = fbref_keys(df)
+    rows = pd.DataFrame({
+        'key': key.values,
+        'Player': df['Player'].astype(str).values,
+        'Nationality': df['Nationality'].astype('string').str.upper().values,
+        'Team': df['Team'].astype(str).values,
+        # "25-035": 25 years and 35 days
+        'age': pd.to_numeric(df['Age'].astype('string').str.split('-').str[0], errors='coerce').values,
+    })
+
+    players = rows.groupby('key', sort=False).agg(Player=('Player', 'first'), Nationality=('Nationality', 'first'),
+                                                  age=('age', 'max'))
+    teams = rows[['key', 'Team']].drop_duplicates()
+    players['Teams'] = teams.groupby('key', sort=False)['Team'].agg('; '.join)
+    return players.reset_index(), teams
+
+
+def transfermarkt_players(tm):
+    """One row per Transfermarkt profile (by the ID in its URL), with its countries as FIFA codes"""
+    tm = tm.copy()
+    urls = tm['URL'].astype('string')
+    profile_ids = urls.str.extract(r'/spieler/(\d+)', expand=False)
+    names = normalize_text(tm['Nume'])
+    tm['key'] = profile_ids.fillna('name:' + names).astype(str)
+    tm = tm[(names != '') | profile_ids.notna()]
+    tm = tm.drop_duplicates('key', keep='last').reset_index(drop=True)
+
+    # The profile URL has the name the player is known by: .../lionel-messi/profil/...
+    slugs = tm['URL'].astype('string').str.extract(r'transfermarkt\.[^/]+/([^/]+)/profil', expand=False)
+    tm['search_name'] = tm['Nume'].fillna('').astype(str) + ' ' + slugs.fillna('').str.replace('-', ' ')
+    tm['age'] = pd.to_numeric(tm['Varsta'], errors='coerce')
+
+    countries = tm[['key']].assign(country=tm['Tara'].astype('string').str.split('\xa0\xa0').values).explode('country')
+    countries['Nationality'] = normalize_text(countries['country']).map(COUNTRY_LOOKUP)
+    return tm, countries.dropna(subset=['Nationality'])[['key', 'Nationality']].drop_duplicates()
+
+
+def candidate_pairs(fb_names, fb_teams, fb_origins, tm_names, tm_teams, tm_origins):
+    """
+    Blocking: the (fb, tm) pairs sharing a name word and a team word, plus those
+    sharing a name word, the nationality and the age bucket
+    """
+    by_team = (fb_names.merge(fb_teams, on='fb').rename(columns={'word_x': 'name', 'word_y': 'team'})
+               .merge(tm_names.merge(tm_teams, on='tm').rename(columns={'word_x': 'name', 'word_y': 'team'}),
+                      on=['name', 'team']))
+    by_origin = (fb_names.merge(fb_origins, on='fb')
+                 .merge(tm_names.merge(tm_origins, on='tm'), on=['word', 'Nationality', 'age']))
+    return pd.concat([by_team[['fb', 'tm']], by_origin[['fb', 'tm']]]).drop_duplicates().reset_index(drop=True)
+
+
+def greedy_matches(links):
+    """
+    One-to-one matching of scored (fb, tm) pairs, best scores first: in each round
+    the pairs that are the best remaining pair of both their player and their
+    profile are kept, and every other pair of either side is dropped, so a player
+    whose best profile went to a better match falls back to their next one
+    """
+    links = links.sort_values(['score', 'name'], ascending=False)
+    matched = []
+    while len(links):
+        best = links.index.intersection(links.drop_duplicates('fb').index).intersection(
+            links.drop_duplicates('tm').index)
+        matched.append(links.loc[best])
+        links = links[~links['fb'].isin(links.loc[best, 'fb']) & ~links['tm'].isin(links.loc[best, 'tm'])]
+    return pd.concat(matched) if matched else links
+
+
+def link_players(fbref, transfermarkt, min_score=MIN_SCORE, min_name_score=MIN_NAME_SCORE):
+    """
+    Crosswalk from FBRef players to Transfermarkt profiles: one row per linked
+    player with both keys, the Transfermarkt name, club, URL and market value, and
+    the score of the link and its parts. Each player and each profile is linked at
+    most once, best scores first.
+    """
+    players, fb_team_rows = fbref_players(fbref)
+    profiles, tm_countries = transfermarkt_players(transfermarkt)
+
+    # Integer ids on both sides keep the joins below cheap
+    fb_ids = pd.Series(np.arange(len(players)), index=players['key'])
+    tm_ids = pd.Series(np.arange(len(profiles)), index=profiles['key'])
+
+    fb_names = word_table(players['key'].map(fb_ids).values, players['Player'].values, NAME_PARTICLES)
+    tm_names = word_table(profiles['key'].map(tm_ids).values, profiles['search_name'].values, NAME_PARTICLES)
+    fb_teams = word_table(fb_team_rows['key'].map(fb_ids).values, fb_team_rows['Team'].values, CLUB_WORDS, 3)
+    tm_teams = word_table(profiles['key'].map(tm_ids).values, profiles['Echipa'].values, CLUB_WORDS, 3)
+    fb_names, tm_names = fb_names.rename(columns={'key': 'fb'}), tm_names.rename(columns={'key': 'tm'})
+    fb_teams, tm_teams = fb_teams.rename(columns={'key': 'fb'}), tm_teams.rename(columns={'key': 'tm'})
+
+    # Age buckets: FBRef ages as they are, Transfermarkt ages one year either side
+    fb_origins = pd.DataFrame({'fb': np.arange(len(players)), 'Nationality': players['Nationality'].values,
+                               'age': players['age'].values}).dropna()
+    tm_origins = (tm_countries.assign(tm=tm_countries['key'].map(tm_ids).values)
+                  .merge(pd.DataFrame({'tm': np.arange(len(profiles)), 'age': profiles['age'].values}).dropna(),
+                         on='tm'))
+    tm_origins = pd.concat([tm_origins.assign(age=tm_origins['age'] + shift) for shift in (-1, 0, 1)])
+    tm_origins = tm_origins[['tm', 'Nationality', 'age']]
+
+    pairs = candidate_pairs(fb_names, fb_teams, fb_origins, tm_names, tm_teams, tm_origins)
+
+    # Score every pair at once: shared name words over the FBRef name's word count,
+    # and whether the teams, nationalities and ages agree
+    shared = pairs.merge(fb_names, on='fb').merge(tm_names, on=['tm', 'word']).groupby(['fb', 'tm']).size()
+    name_words = fb_names.groupby('fb').size()
+    pairs['name'] = (pd.MultiIndex.from_frame(pairs[['fb', 'tm']]).map(shared).fillna(0).to_numpy()
+                     / name_words.reindex(pairs['fb']).to_numpy())
+
+    def agrees(fb_table, tm_table, on):
+        matched = pairs[['fb', 'tm']].merge(fb_table, on='fb').merge(tm_table, on=['tm', on])[['fb', 'tm']]
+        matched = pd.MultiIndex.from_frame(matched.drop_duplicates())
+        return pd.MultiIndex.from_frame(pairs[['fb', 'tm']]).isin(matched).astype(float)
+
+    pairs['team'] = agrees(fb_teams, tm_teams, 'word')
+    pairs['nationality'] = agrees(fb_origins[['fb', 'Nationality']], tm_origins[['tm', 'Nationality']].drop_duplicates(),
+                                  'Nationality')
+    age_gap = np.abs(players['age'].to_numpy()[pairs['fb']] - profiles['age'].to_numpy()[pairs['tm']])
+    pairs['age'] = (age_gap <= 1).astype(float)
+    pairs['score'] = sum(weight * pairs[part] for part, weight in WEIGHTS.items())
+
+    links = greedy_matches(pairs[(pairs['name'] >= min_name_score) & (pairs['score'] >= min_score)])
+
+    fb_rows, tm_rows = players.iloc[links['fb']], profiles.iloc[links['tm']]
+    return pd.DataFrame({
+        'Player ID': fb_rows['key'].values,
+        'Player': fb_rows['Player'].values,
+        'Teams': fb_rows['Teams'].values,
+        'Transfermarkt ID': tm_rows['key'].values,
+        'Nume': tm_rows['Nume'].values,
+        'Echipa': tm_rows['Echipa'].values,
+        'URL': tm_rows['URL'].values,
+        'Market_Value': tm_rows['Market_Value'].values,
+        'Score': links['score'].round(3).values,
+        'Name Score': links['name'].round(3).values,
+        'Team Match': links['team'].astype(bool).values,
+        'Nationality Match': links['nationality'].astype(bool).values,
+        'Age Match': links['age'].astype(bool).values,
+    }).sort_values('Player', ignore_index=True)
+
+
+def join_market_values(fbref, crosswalk):
+    """
+    The FBRef rows with each linked player's Transfermarkt ID and market value in
+    euros, matched on the crosswalk's player key (see fbref_keys)
+    """
+    values = pd.DataFrame({'_key': crosswalk['Player ID'].astype(str).values,
+                           'Transfermarkt ID': crosswalk['Transfermarkt ID'].values,
+                           'Market Value': parse_market_value(crosswalk['Market_Value']).values})
+    joined = fbref.assign(_key=fbref_keys(fbref).values).merge(values, on='_key', how='left')
+    return joined.drop(columns='_key')
+
+
+def load_transfermarkt(path):
+    return pd.read_csv(path, encoding='utf-8-sig', dtype=str)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Link FBRef players to their Transfermarkt profiles")
+    parser.add_argument("--fbref", default=DEFAULT_FBREF_PATH,
+                        help=f"FBRef dataset, CSV or Parquet directory (default: {DEFAULT_FBREF_PATH})")
+    parser.add_argument("--transfermarkt", default=DEFAULT_TRANSFERMARKT_PATH,
+                        help=f"Transfermarkt players CSV (default: {DEFAULT_TRANSFERMARKT_PATH})")
+    parser.add_argument("--output", default=DEFAULT_CROSSWALK_PATH,
+                        help=f"where to save the crosswalk (default: {DEFAULT_CROSSWALK_PATH})")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE,
+                        help=f"lowest score that counts as a link (default: {MIN_SCORE})")
+    parser.add_argument("--joined", default=None,
+                        help="also save the FBRef dataset with market values joined on to this CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Older datasets have no Player ID column
+    columns = None if args.joined else [col for col in FBREF_COLUMNS if col in dataset_columns(args.fbref)]
+    fbref = load_dataset(args.fbref, columns=columns, compact=False)
+    transfermarkt = load_transfermarkt(args.transfermarkt)
+
+    start = time.perf_counter()
+    crosswalk = link_players(fbref, transfermarkt, args.min_score)
+    elapsed = time.perf_counter() - start
+
+    crosswalk.to_csv(args.output, index=False, encoding='utf-8-sig')
+    players = fbref_keys(fbref).nunique()
+    print(f"🔗 Linked {len(crosswalk):,} of {players:,} FBRef players to {len(transfermarkt):,} Transfermarkt rows "
+          f"in {elapsed:.2f}s")
+    print(f"💾 Crosswalk saved to {args.output}")
+
+    if args.joined:
+        join_market_values(fbref, crosswalk).to_csv(args.joined, index=False, encoding='utf-8-sig')
+        print(f"💾 Dataset with market values saved to {args.joined}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
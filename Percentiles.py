@@ -0,0 +1,200 @@
+"""
+Percentile ranks of every stat of the scraped player dataset.
+
+Each player row is ranked on every numeric column against four populations at
+once: all players, their tier, their league and their position group (GK, DF, MF
+or FW, from the first position FBRef lists). Each population is ranked with one
+grouped, vectorized pass over all stat columns, and the result is saved next to
+the dataset (Football_Players_Data.percentiles.parquet) with the dataset's
+signature (see Query.source_signature). Readers get the saved ranks back as long
+as the dataset is unchanged, and they are recomputed once when it changes.
+
+    python Percentiles.py "Bukayo Saka"
+    python Percentiles.py "Bukayo Saka" --team Arsenal --stats "Performance Gls,Expected xG"
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for the cache
+    pa = None
+
+from Dataset import load_dataset
+from Query import default_data_path, source_signature
+
+# Columns kept with the ranks, to find and group the players
+IDENTITY_COLUMNS = ['League', 'Tier', 'Player', 'Player ID', 'Team', 'Pos']
+# Numeric columns that aren't stats
+NON_STAT_COLUMNS = ['Born']
+
+POSITION_GROUP = 'Position Group'
+# Scope -> the column its players are grouped by (None: everyone)
+SCOPES = {'Overall': None, 'Tier': 'Tier', 'League': 'League', 'Position': POSITION_GROUP}
+
+SIGNATURE_KEY = b'dataset_signature'
+
+
+def default_cache_path(data_path):
+    """Football_Players_Data.parquet -> Football_Players_Data.percentiles.parquet"""
+    return os.path.splitext(data_path.rstrip('/\\'))[0] + '.percentiles.parquet'
+
+
+def percentile_column(stat, scope):
+    """'Performance Gls', 'League' -> 'Performance Gls Percentile League'"""
+    return f"{stat} Percentile {scope}"
+
+
+def stat_columns(df):
+    return [col for col in df.columns
+            if col not in NON_STAT_COLUMNS and col not in IDENTITY_COLUMNS and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def compute_percentiles(df, scopes=SCOPES):
+    """
+    Percentile (0-100, higher = more of the stat) of every stat of every row within
+    each scope's groups; rows without a stat get no rank for it. One frame with the
+    identity columns, the position group and a column per stat and scope. Scopes
+    grouped by a column the dataset doesn't have (e.g. no 'Pos') are left out.
+    """
+    stats = stat_columns(df)
+    result = df[[col for col in IDENTITY_COLUMNS if col in df.columns]].copy()
+    if 'Pos' in df.columns:
+        result[POSITION_GROUP] = df['Pos'].astype('string').str.split(',').str[0].str.strip()
+
+    values = df[stats]
+    ranked = []
+    for scope, by in scopes.items():
+        if by is not None and by not in result.columns and by not in df.columns:
+            continue
+        if by is None:
+            ranks = values.rank(pct=True)
+        else:
+            keys = result[by] if by == POSITION_GROUP else df[by]
+            ranks = values.groupby(keys.astype('string').values, dropna=False).rank(pct=True)
+        ranks = (ranks * 100).round(1).astype('float32')
+        ranks.columns = [percentile_column(stat, scope) for stat in stats]
+        ranked.append(ranks)
+
+    return pd.concat([result] + ranked, axis=1)
+
+
+def save_percentiles(ranks, path, signature):
+    """Write the ranks as Parquet, with the dataset signature in the file's metadata"""
+    if pa is None:
+        raise SystemExit("The percentile cache needs pyarrow: pip install pyarrow")
+
+    table = pa.Table.from_pandas(ranks, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), SIGNATURE_KEY: signature.encode()})
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def cached_signature(path):
+    """Signature of the dataset a saved percentile file was computed from (None if there is none)"""
+    if pa is None or not os.path.exists(path):
+        return None
+    metadata = pq.read_schema(path).metadata or {}
+    return metadata.get(SIGNATURE_KEY, b'').decode() or None
+
+
+def load_percentiles(data_path=None, cache_path=None, columns=None, rebuild=False):
+    """
+    Percentile ranks of the dataset, from the cache when it was computed from the
+    dataset as it is now, otherwise computed and cached. `columns` limits the
+    columns read from the cache (the identity columns are always included).
+    """
+    data_path = data_path or default_data_path()
+    cache_path = cache_path or default_cache_path(data_path)
+    if pa is None:
+        raise SystemExit("The percentile cache needs pyarrow: pip install pyarrow")
+
+    # Without a dataset on disk, whatever ranks were saved are all there is
+    signature = source_signature(data_path)
+    stored = cached_signature(cache_path)
+    if rebuild or stored is None or (signature is not None and stored != signature):
+        start = time.perf_counter()
+        df = load_dataset(data_path, compact=False)
+        ranks = compute_percentiles(df)
+        save_percentiles(ranks, cache_path, signature)
+        print(f"📐 Ranked {len(ranks):,} player rows on {len(stat_columns(df))} stats into {cache_path} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    if columns is not None:
+        available = pq.read_schema(cache_path).names
+        columns = [col for col in IDENTITY_COLUMNS + [POSITION_GROUP] if col in available] + \
+                  [col for col in columns if col in available and col not in IDENTITY_COLUMNS + [POSITION_GROUP]]
+    return pd.read_parquet(cache_path, columns=columns)
+
+
+def player_profile(ranks, player, team=None, stats=None):
+    """
+    One player's percentiles as a table of stats x scopes, for their row with the
+    most minutes (or at `team`). Raises KeyError when the player isn't in `ranks`.
+    """
+    matches = ranks['Player'].str.lower() == player.lower()
+    if 'Player ID' in ranks.columns:
+        matches |= ranks['Player ID'] == player
+    rows = ranks[matches]
+    if team is not None:
+        rows = rows[rows['Team'].str.lower() == team.lower()]
+    if rows.empty:
+        raise KeyError(f"No player {player!r}" + (f" at {team!r}" if team else ""))
+
+    minutes = percentile_column('Playing Time 90s', 'Overall')
+    row = rows.loc[rows[minutes].idxmax()] if minutes in rows.columns and rows[minutes].notna().any() else rows.iloc[0]
+
+    names = [col[:-len(' Percentile Overall')] for col in ranks.columns if col.endswith(' Percentile Overall')]
+    scopes = [scope for scope in SCOPES if any(col.endswith(f" Percentile {scope}") for col in ranks.columns)]
+    profile = pd.DataFrame({scope: [row.get(percentile_column(stat, scope)) for stat in names] for scope in scopes},
+                           index=pd.Index(names, name='Stat'), dtype='float64').round(1)
+    if stats is not None:
+        profile = profile.loc[[stat for stat in stats if stat in profile.index]]
+    # Stats the player has no value for, e.g. goalkeeping stats of an outfielder
+    return row, profile.dropna(how='all')
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Percentile ranks of a player's stats within tier, league and position")
+    parser.add_argument("player", help="player name or FBRef player ID")
+    parser.add_argument("--team", default=None, help="the player's team, for players with rows at several clubs")
+    parser.add_argument("--stats", type=lambda value: [stat.strip() for stat in value.split(',') if stat.strip()],
+                        default=None, help="comma-separated stats to show (default: all)")
+    parser.add_argument("--data", default=None, help="Parquet directory or CSV file (default: as Query.py)")
+    parser.add_argument("--cache", default=None, help="percentile file (default: next to the data, .percentiles.parquet)")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the ranks even if the dataset hasn't changed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    start = time.perf_counter()
+    columns = None
+    if args.stats is not None:
+        columns = [percentile_column(stat, scope) for stat in args.stats + ['Playing Time 90s'] for scope in SCOPES]
+    ranks = load_percentiles(args.data, args.cache, columns, args.rebuild)
+    try:
+        row, profile = player_profile(ranks, args.player, args.team, args.stats)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    details = [row[col] for col in ['Team', 'League', 'Tier', POSITION_GROUP] if col in row.index]
+    print(f"📊 {row['Player']} ({', '.join(map(str, details))}) - percentiles")
+    with pd.option_context('display.max_rows', None, 'display.width', None):
+        print(profile.to_string())
+    print(f"\n⏱️  {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
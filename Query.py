@@ -0,0 +1,279 @@
+"""
+Embedded SQL query layer over the scraped player dataset.
+
+The dataset (the partitioned Parquet directory written with --parquet, or the
+combined CSV) is loaded once into a DuckDB database file next to it, sorted by
+tier, league and team and indexed on League, Tier, Team and Player. DuckDB stores
+every column separately and keeps min/max statistics per row group, so a query
+only reads the columns it names and skips the row groups of other tiers and
+leagues. The database is rebuilt automatically when the dataset changes.
+
+Analysis.py, Similarity.py and Percentiles.py query through this layer too, so
+any of them writes Football_Players_Data.duckdb on first use (git ignores it).
+When the dataset's directory isn't writable the database is built in memory
+instead, once per run.
+
+    python Query.py top "Performance Gls" --tier "Tier 1" --min-90s 5 -n 20
+    python Query.py group Team "Per 90 Minutes G+A" --min-90s 5 -n 15
+    python Query.py sql "SELECT League, COUNT(*) AS Players FROM players GROUP BY League"
+    python Query.py columns
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # only needed for queries
+    duckdb = None
+
+from Dataset import TEXT_COLUMNS
+
+DEFAULT_DATA_PATH = "Football_Players_Data.parquet"
+FALLBACK_DATA_PATH = "Football_Players_Data.csv"
+
+TABLE = "players"
+INDEXED_COLUMNS = ['League', 'Tier', 'Team', 'Player']
+SORT_COLUMNS = ['Tier', 'League', 'Team']
+
+# Columns shown next to every ranked stat, and the playing time filtered on
+RANKING_COLUMNS = ['Player', 'Team', 'League', 'Tier']
+MINUTES_COLUMN = 'Playing Time 90s'
+
+
+def default_data_path():
+    """The Parquet dataset when it exists, otherwise the combined CSV"""
+    return DEFAULT_DATA_PATH if os.path.exists(DEFAULT_DATA_PATH) else FALLBACK_DATA_PATH
+
+
+def default_db_path(data_path):
+    """Football_Players_Data.parquet -> Football_Players_Data.duckdb"""
+    return os.path.splitext(data_path.rstrip('/\\'))[0] + '.duckdb'
+
+
+def can_write(path):
+    """Whether `path` can be written: the file itself if it exists, else its directory"""
+    if os.path.exists(path):
+        return os.access(path, os.W_OK)
+    return os.access(os.path.dirname(os.path.abspath(path)), os.W_OK)
+
+
+def source_signature(path):
+    """Cheap fingerprint of the dataset on disk: its path, file count, newest mtime and total size"""
+    if os.path.isdir(path):
+        files = [os.path.join(dirpath, name) for dirpath, _, names in os.walk(path)
+                 for name in names if name.endswith('.parquet')]
+    else:
+        files = [path] if os.path.exists(path) else []
+    if not files:
+        return None
+    stats = [os.stat(file) for file in files]
+    return (f"{os.path.abspath(path)}:{len(files)}:{max(stat.st_mtime_ns for stat in stats)}:"
+            f"{sum(stat.st_size for stat in stats)}")
+
+
+def quote_column(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class PlayerQueries:
+    """
+    Rankings and group-bys over the player dataset, answered by DuckDB.
+    Every method takes the same optional filters - `tiers`, `leagues`, `teams` and
+    `min_90s` (more than this many full matches played) - and returns a DataFrame.
+    Column names are checked against the table, and filter values are passed as
+    query parameters, so neither can change the SQL.
+    """
+
+    def __init__(self, data_path=None, db_path=None, rebuild=False, read_only=False):
+        if duckdb is None:
+            raise SystemExit("Queries need duckdb: pip install duckdb")
+
+        self.data_path = data_path or default_data_path()
+        self.db_path = db_path or default_db_path(self.data_path)
+        if not read_only and not can_write(self.db_path):
+            print(f"⚠️  Can't write {self.db_path}; loading the dataset into memory instead")
+            self.db_path = ':memory:'
+        self.con = duckdb.connect(self.db_path, read_only=read_only)
+
+        signature = source_signature(self.data_path)
+        stored = self._stored_signature()
+        if signature is None and stored is None:
+            raise SystemExit(f"No dataset at {self.data_path}; run Scraper.py first")
+        if not read_only and signature is not None and (rebuild or signature != stored):
+            self.build(signature)
+
+        self.columns = [row[0] for row in self.con.execute(f"DESCRIBE {TABLE}").fetchall()]
+
+    def _stored_signature(self):
+        try:
+            row = self.con.execute("SELECT signature FROM _source").fetchone()
+        except duckdb.CatalogException:
+            return None
+        return row[0] if row else None
+
+    def _source_relation(self):
+        """SQL (and parameters) reading the dataset, with text columns kept as text"""
+        if os.path.isdir(self.data_path):
+            # Tier and League come from the Tier=/League= directory names
+            return ("read_parquet(?, hive_partitioning = true, union_by_name = true, "
+                    "hive_types = {'Tier': VARCHAR, 'League': VARCHAR})",
+                    [os.path.join(self.data_path, '**', '*.parquet')])
+
+        header = pd.read_csv(self.data_path, encoding='utf-8-sig', nrows=0).columns
+        types = ', '.join(f"'{col}': 'VARCHAR'" for col in TEXT_COLUMNS if col in header)
+        return f"read_csv(?, header = true, types = {{{types}}})", [self.data_path]
+
+    def build(self, signature):
+        """(Re)load the dataset into the database, sorted for pruning and indexed"""
+        start = time.perf_counter()
+        relation, params = self._source_relation()
+        columns = self.con.execute(f"DESCRIBE SELECT * FROM {relation}", params).fetchall()
+        order = ', '.join(quote_column(col) for col in SORT_COLUMNS if col in {row[0] for row in columns})
+
+        self.con.execute("BEGIN TRANSACTION")
+        self.con.execute(f"CREATE OR REPLACE TABLE {TABLE} AS SELECT * FROM {relation}"
+                         + (f" ORDER BY {order}" if order else ""), params)
+        for col in INDEXED_COLUMNS:
+            if col in {row[0] for row in columns}:
+                self.con.execute(f"CREATE INDEX idx_{TABLE}_{col.lower()} ON {TABLE} ({quote_column(col)})")
+        self.con.execute("CREATE OR REPLACE TABLE _source (path VARCHAR, signature VARCHAR)")
+        self.con.execute("INSERT INTO _source VALUES (?, ?)", [self.data_path, signature])
+        self.con.execute("COMMIT")
+
+        rows = self.con.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0]
+        print(f"🦆 Loaded {rows:,} rows from {self.data_path} into {self.db_path} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def column(self, name):
+        """Quoted identifier of a dataset column; ValueError for unknown names"""
+        if name not in self.columns:
+            raise ValueError(f"Unknown column {name!r}; see `python Query.py columns`")
+        return quote_column(name)
+
+    def _where(self, tiers=None, leagues=None, teams=None, min_90s=None, not_null=()):
+        clauses, params = [], []
+        for col, values in [('Tier', tiers), ('League', leagues), ('Team', teams)]:
+            if values is None:
+                continue
+            values = list(values)
+            if not values:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"{self.column(col)} IN ({', '.join('?' * len(values))})")
+            params += values
+        if min_90s is not None:
+            clauses.append(f"{self.column(MINUTES_COLUMN)} > ?")
+            params.append(min_90s)
+        clauses += [f"{self.column(col)} IS NOT NULL" for col in not_null]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def sql(self, query, params=None):
+        """Run any SQL against the `players` table"""
+        return self.con.execute(query, params or []).df()
+
+    def select(self, columns, **filters):
+        """The given columns of every player row passing the filters"""
+        where, params = self._where(**filters)
+        return self.sql(f"SELECT {', '.join(self.column(col) for col in columns)} FROM {TABLE}{where}", params)
+
+    def top_players(self, stat, n=20, ascending=False, extra_columns=(), **filters):
+        """
+        The `n` player rows with the highest (or lowest) `stat`; rows without it, or
+        without any of the columns in a `not_null` filter, are left out
+        """
+        columns = [col for col in RANKING_COLUMNS if col in self.columns]
+        columns += [col for col in extra_columns if col not in columns and col != stat] + [stat]
+        where, params = self._where(not_null=[stat, *filters.pop('not_null', ())], **filters)
+        return self.sql(f"SELECT {', '.join(self.column(col) for col in columns)} FROM {TABLE}{where} "
+                        f"ORDER BY {self.column(stat)} {'ASC' if ascending else 'DESC'} LIMIT ?",
+                        params + [n])
+
+    def group_average(self, by, stats, n=None, ascending=False, **filters):
+        """
+        Mean of each of `stats` per value of `by` (e.g. Team or Tier), with the
+        number of players averaged, ordered by the first stat
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        stats = [stats] if isinstance(stats, str) else list(stats)
+        where, params = self._where(**filters)
+        groups = ', '.join(self.column(col) for col in by)
+        averages = ', '.join(f"AVG({self.column(stat)}) AS {self.column(stat)}" for stat in stats)
+        query = (f"SELECT {groups}, {averages}, COUNT(*) AS Players FROM {TABLE}{where} GROUP BY {groups} "
+                 f"ORDER BY {self.column(stats[0])} {'ASC' if ascending else 'DESC'} NULLS LAST")
+        if n is not None:
+            query += " LIMIT ?"
+            params.append(n)
+        return self.sql(query, params)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Query the scraped player dataset with DuckDB")
+    parser.add_argument("--data", default=None,
+                        help=f"Parquet directory or CSV file (default: {DEFAULT_DATA_PATH}, else {FALLBACK_DATA_PATH})")
+    parser.add_argument("--db", default=None, help="DuckDB database file (default: next to the data, .duckdb)")
+    parser.add_argument("--rebuild", action="store_true", help="reload the dataset even if it hasn't changed")
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--tier", action="append", dest="tiers", help="only this tier (repeatable)")
+    filters.add_argument("--league", action="append", dest="leagues", help="only this league (repeatable)")
+    filters.add_argument("--team", action="append", dest="teams", help="only this team (repeatable)")
+    filters.add_argument("--min-90s", type=float, default=None,
+                         help=f"only players with more than this many '{MINUTES_COLUMN}'")
+    filters.add_argument("-n", type=int, default=20, help="rows to show (default: 20)")
+    filters.add_argument("--ascending", action="store_true", help="lowest values first")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", parents=[filters], help="players ranked by a stat")
+    top.add_argument("stat", help="column to rank by, e.g. 'Performance Gls'")
+    group = commands.add_parser("group", parents=[filters], help="average stats per team, league, tier, ...")
+    group.add_argument("by", help="column to group by, e.g. Team")
+    group.add_argument("stats", nargs='+', help="columns to average")
+    sql = commands.add_parser("sql", help="run SQL against the `players` table")
+    sql.add_argument("query")
+    commands.add_parser("columns", help="list the dataset's columns")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with PlayerQueries(args.data, args.db, rebuild=args.rebuild) as queries:
+        start = time.perf_counter()
+        try:
+            if args.command == "top":
+                result = queries.top_players(args.stat, args.n, args.ascending, tiers=args.tiers,
+                                             leagues=args.leagues, teams=args.teams, min_90s=args.min_90s)
+            elif args.command == "group":
+                result = queries.group_average(args.by, args.stats, args.n, args.ascending, tiers=args.tiers,
+                                               leagues=args.leagues, teams=args.teams, min_90s=args.min_90s)
+            elif args.command == "sql":
+                result = queries.sql(args.query)
+            else:
+                result = pd.DataFrame({'Column': queries.columns})
+        except (ValueError, duckdb.Error) as e:
+            print(f"❌ {e}")
+            return 1
+        elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.max_columns', None, 'display.width', None):
+        print(result.to_string(index=False))
+    print(f"\n⏱️  {len(result):,} rows in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
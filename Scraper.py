@@ -1,16 +1,193 @@
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import queue
+import threading
 import time
 import os
 import re
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import urljoin, urlparse
 
+from Dataset import (DatasetWriter, ParquetDatasetWriter, SeasonArchive, apply_schema, clean_league_frame,
+                     describe_schema_report, join_categories, upsert_rows)
+
+try:
+    import aiohttp
+except ImportError:  # only needed by the async engine
+    aiohttp = None
+
+# Site scraped; --base-url points the scraper at a mirror or a local stand-in instead
+DEFAULT_BASE_URL = "https://fbref.com"
+
+# Number of Chrome drivers (and scraping workers) used when none is given
+DEFAULT_WORKERS = 4
+
+# FBRef asks for no more than 10 requests per minute; shared by all workers
+DEFAULT_REQUESTS_PER_MINUTE = 10
+DEFAULT_BURST = 1
+
+# Seconds to wait for a page's data to appear before giving up on it
+DEFAULT_PAGE_TIMEOUT = 20
+
+# Ways of fetching pages: plain HTTP with a Selenium fallback, or Selenium only
+FETCH_MODES = ['http', 'selenium']
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+HTTP_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Async engine: most HTTP requests open at once
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Responses that are worth retrying after a pause, how often, and the base of the
+# exponential pause between attempts (2s, 4s, 8s)
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+HTTP_RETRIES = 3
+BACKOFF_FACTOR = 2
+# Longest pause a server's Retry-After can ask for, so a bad header can't stall a worker
+MAX_RETRY_AFTER = 120
+
+
+class MissingPage(Exception):
+    """The server answered that a page doesn't exist (a 4xx other than 429), e.g. a stats category a league doesn't publish"""
+
+
+def is_missing_status(status):
+    return 400 <= status < 500 and status not in RETRY_STATUSES
+
+# Where fetched pages are cached between runs, and for how long (seconds) they are
+# served without asking FBRef whether they changed
+DEFAULT_CACHE_DIR = ".fbref_cache"
+DEFAULT_CACHE_TTL = 6 * 60 * 60
+
+# Each run checkpoints its leagues under <runs dir>/<run id>/
+DEFAULT_RUNS_DIR = "scrape_runs"
+COMBINED_FILENAME = "Football_Players_Data.csv"
+PARQUET_DIRNAME = "Football_Players_Data.parquet"
+
+# Completed seasons fetched by --backfill are kept for good in a season-partitioned
+# archive; by default a backfill goes back this many seasons per league
+DEFAULT_ARCHIVE_DIR = "fbref_seasons"
+DEFAULT_BACKFILL_SEASONS = 5
+
+# FBRef's stats categories: the path segment of a league's page for the category, the
+# ids of its player table and the prefix of its columns in the dataset (none for standard)
+STAT_CATEGORIES = {
+    'standard': ('stats', ('stats_standard', 'stats_players'), ''),
+    'shooting': ('shooting', ('stats_shooting',), 'Shooting'),
+    'passing': ('passing', ('stats_passing',), 'Passing'),
+    'gca': ('gca', ('stats_gca',), 'GCA'),
+    'defense': ('defense', ('stats_defense',), 'Defense'),
+    'possession': ('possession', ('stats_possession',), 'Possession'),
+    'keepers': ('keepers', ('stats_keeper',), 'Keepers'),
+}
+DEFAULT_CATEGORIES = ['standard']
+
+# Elements whose presence means the competitions and season history pages are ready to be parsed
+COMPETITIONS_TABLE_SELECTOR = "table"
+SEASONS_TABLE_SELECTOR = "table#seasons"
+SEASON_PATTERN = re.compile(r'^\d{4}(-\d{4})?$')
+
+# Lean drivers (--lean-driver) only download documents: stylesheets, fonts, scripts,
+# media and known ad/analytics hosts are blocked through DevTools, and each pool slot
+# keeps a persistent Chrome profile under DEFAULT_PROFILE_DIR so it starts warm
+LEAN_BLOCKED_URLS = [
+    '*.css', '*.css?*', '*.js', '*.js?*', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico', '*.mp4', '*.webm',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*adservice.google.*', '*amazon-adsystem.com*', '*adnxs.com*', '*rubiconproject.com*',
+    '*pubmatic.com*', '*criteo.com*', '*criteo.net*', '*quantserve.com*', '*scorecardresearch.com*',
+    '*moatads.com*', '*taboola.com*', '*outbrain.com*', '*facebook.net*', '*hotjar.com*',
+]
+LEAN_CHROME_ARGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--mute-audio",
+]
+DEFAULT_PROFILE_DIR = ".fbref_chrome_profiles"
+LEAN_DRIVER = False
+# Whether an element matching arguments[0] is inside one of the page's HTML comments
+# (external scripts are blocked in lean drivers, not scripts run through WebDriver)
+COMMENTED_ELEMENT_SCRIPT = """
+const walker = document.createTreeWalker(document, NodeFilter.SHOW_COMMENT);
+const template = document.createElement('template');
+for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    template.innerHTML = node.data;
+    if (template.content.querySelector(arguments[0])) return true;
+}
+return false;
+"""
+DRIVER_PROFILE_DIR = None
+
+# libxml2 drops text nodes over 10 MB by default, which truncates very large
+# commented-out tables; huge_tree lifts that limit
+HTML_PARSER = lxml.html.HTMLParser(huge_tree=True)
+
+# FBRef's player ID, from player links like /en/players/52e6b438/Max-Aarons
+PLAYER_ID_PATTERN = re.compile(r'/players/([0-9a-f]+)/')
+
+
+def clear_stale_profile_lock(profile_dir):
+    """
+    Remove the lock a crashed Chrome left in its profile, which would stop the next
+    driver from starting. The lock is a symlink to "<host>-<pid>"; it is only
+    removed when that process is gone.
+    """
+    lock = os.path.join(profile_dir, 'SingletonLock')
+    try:
+        pid = int(os.readlink(lock).rsplit('-', 1)[-1])
+    except (OSError, ValueError):
+        return
+
+    try:
+        os.kill(pid, 0)
+        return
+    except ProcessLookupError:
+        pass
+    except OSError:
+        return
 
-def setup_driver():
-    """Set up and return a configured Chrome driver"""
+    for name in ['SingletonLock', 'SingletonSocket', 'SingletonCookie']:
+        try:
+            os.remove(os.path.join(profile_dir, name))
+        except FileNotFoundError:
+            pass
+
+
+def setup_driver(profile_dir=None):
+    """
+    Set up and return a configured Chrome driver. With LEAN_DRIVER only documents
+    are downloaded (see LEAN_BLOCKED_URLS) and `profile_dir` is kept as a warm,
+    persistent Chrome profile.
+    """
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--disable-gpu")
@@ -25,8 +202,7 @@ def setup_driver():
     options.add_argument("--lang=en-US,en")
     options.add_argument("--accept-lang=en-US,en")
     options.add_argument("--accept-charset=utf-8")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
 
     # Set encoding preferences
     prefs = {
@@ -37,136 +213,760 @@ def setup_driver():
     }
     options.add_experimental_option("prefs", prefs)
 
-    return webdriver.Chrome(options=options)
+    if LEAN_DRIVER:
+        for argument in LEAN_CHROME_ARGS:
+            options.add_argument(argument)
+        # Nothing but the document is loaded, so there is nothing to wait for after DOMContentLoaded
+        options.page_load_strategy = 'eager'
+
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        clear_stale_profile_lock(profile_dir)
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+
+    with timed_stage('driver_start', lean=LEAN_DRIVER, profile=bool(profile_dir)):
+        driver = webdriver.Chrome(options=options)
+
+    if LEAN_DRIVER:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        except Exception:
+            driver.quit()
+            raise
+    return driver
 
 
-def discover_domestic_leagues_by_tier():
+class TokenBucket:
     """
-    Discover domestic leagues from FBRef's competitions page, specifically from the
-    1st Tier, 2nd Tier, and 3rd Tier and Lower sections
+    Thread-safe token bucket: holds up to `capacity` tokens and refills at
+    `rate` tokens per second. acquire() blocks until a token is available.
     """
-    print("Discovering domestic leagues from FBRef competitions page...")
 
-    base_url = "https://fbref.com"
-    competitions_url = "https://fbref.com/en/comps/"
+    def __init__(self, rate, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token now and return how many seconds the caller must wait before
+        using it. Tokens can be reserved ahead, so waiters are served in order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Take one token, sleeping until the bucket has refilled enough"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Take one token without blocking the event loop"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    One shared TokenBucket per host, so concurrent workers (threads or coroutines)
+    share a single request budget. Domains can be given their own budget in
+    `domain_budgets` ({"fbref.com": 10}); it also applies to their subdomains.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST,
+                 domain_budgets=None):
+        self.configure(requests_per_minute, burst, domain_budgets)
+
+    def configure(self, requests_per_minute, burst=DEFAULT_BURST, domain_budgets=None):
+        """Set the per-host budgets; existing buckets are replaced"""
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.domain_budgets = dict(domain_budgets or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def budget(self, host):
+        """Requests per minute allowed for a host"""
+        host = host.split(':')[0]
+        for domain, requests_per_minute in self.domain_budgets.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return requests_per_minute
+        return self.requests_per_minute
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.budget(host) / 60.0, self.burst)
+                self._buckets[host] = bucket
+        return bucket
+
+    def wait(self, url):
+        """Block until a request to the URL's host is allowed"""
+        self.bucket(url).acquire()
+
+    async def wait_async(self, url):
+        """Wait, without blocking the event loop, until a request to the URL's host is allowed"""
+        await self.bucket(url).acquire_async()
+
+
+# Shared by discovery and every scraping worker
+RATE_LIMITER = HostRateLimiter()
+
+
+class PageCache:
+    """
+    Persistent on-disk page cache keyed by URL.
+
+    Page bodies are stored gzip-compressed under the SHA-256 of their content, so a
+    page that hasn't changed is only stored once. A small JSON index entry per URL
+    (and kind: 'http' for server HTML, 'rendered' for Selenium page sources) points
+    at the body and records when it was fetched plus its ETag/Last-Modified headers.
+    Entries younger than `ttl` seconds are served directly; older ones are
+    revalidated with a conditional request.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def lookup(self, url, kind='http'):
+        """Return the index entry for a URL, or None if it was never cached"""
+        try:
+            with open(self._index_path(url, kind), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(self._blob_path(entry['sha256'])):
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        """True if the entry is younger than the TTL"""
+        return self.ttl is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    def get_fresh(self, url, kind='http'):
+        """Return the cached body if it is still within the TTL, else None"""
+        entry = self.lookup(url, kind)
+        if entry is not None and self.is_fresh(entry):
+            return self.read_body(entry)
+        return None
+
+    def read_body(self, entry):
+        with gzip.open(self._blob_path(entry['sha256']), 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for revalidating a cached entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, body, headers=None, kind='http'):
+        """Save a freshly fetched page and its validators"""
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(body)
+            os.replace(tmp_path, blob_path)
+
+        headers = headers or {}
+        self._write_entry(url, kind, {
+            'url': url,
+            'kind': kind,
+            'sha256': digest,
+            'fetched_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        })
+
+    def touch(self, url, entry, headers=None, kind='http'):
+        """Mark an entry as fresh again after a 304 Not Modified"""
+        entry = dict(entry, fetched_at=time.time())
+        if headers:
+            entry['etag'] = headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = headers.get('Last-Modified', entry.get('last_modified'))
+        self._write_entry(url, kind, entry)
+
+    def _write_entry(self, url, kind, entry):
+        index_path = self._index_path(url, kind)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, index_path)
+
+    def _index_path(self, url, kind):
+        key = hashlib.sha256(f"{kind}:{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'index', f"{key}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, 'pages', digest[:2], f"{digest}.html.gz")
+
+
+# Shared by discovery and every scraping worker; None disables caching
+PAGE_CACHE = PageCache()
+
+
+# Manifest key of the league the current thread or asyncio task is working on
+CURRENT_LEAGUE = contextvars.ContextVar('current_league', default=None)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+class RunMetrics:
+    """
+    Structured timing and size metrics of a scrape run, appended as JSON lines to
+    metrics.jsonl in the run directory. 'stage' events time one step for one
+    league (driver start, rate-limit waits, fetch, page load, HTML parsing, table
+    extraction, cleaning, checkpointing) with the page bytes, rows and columns
+    involved; a 'league' event closes each league with its total time. Events are
+    tagged with CURRENT_LEAGUE, and summary() aggregates this attempt's events into
+    the slowest stages and leagues.
+    """
+
+    FILENAME = "metrics.jsonl"
+    SUMMARY_FILENAME = "metrics_summary.json"
+
+    # Stages that deliver a page; their bytes make up a league's page size
+    PAGE_STAGES = {'fetch', 'page_source'}
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._started = time.monotonic()
+        self._stage_seconds = defaultdict(list)
+        self._leagues = defaultdict(lambda: {'stages': defaultdict(float), 'bytes': 0})
+        self._lock = threading.Lock()
+        self._file = open(os.path.join(run_dir, self.FILENAME), 'a', encoding='utf-8')
+
+    def emit(self, event, **fields):
+        """Append one event, tagged with the current league"""
+        record = {'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                  'event': event, 'league': CURRENT_LEAGUE.get(), **fields}
+
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+
+            if event == 'stage':
+                self._stage_seconds[record['stage']].append(record['seconds'])
+            if record['league'] is None:
+                return
+            league = self._leagues[record['league']]
+            if event == 'stage':
+                league['stages'][record['stage']] += record['seconds']
+                if record['stage'] in self.PAGE_STAGES:
+                    league['bytes'] += record.get('bytes') or 0
+                for size in ['rows', 'columns']:
+                    if size in record:
+                        league[size] = record[size]
+            elif event == 'league':
+                league.update({k: v for k, v in record.items() if k in ['name', 'tier', 'status', 'seconds']})
+
+    def stage(self, stage, seconds, **fields):
+        self.emit('stage', stage=stage, seconds=round(seconds, 6), **fields)
+
+    def summary(self, top=10):
+        """Aggregate of this attempt: throughput, time per stage and the slowest leagues"""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            leagues = [dict(league, key=key) for key, league in self._leagues.items() if 'status' in league]
+
+            stages = {
+                stage: {
+                    'count': len(seconds),
+                    'total_seconds': round(sum(seconds), 3),
+                    'mean_seconds': round(sum(seconds) / len(seconds), 4),
+                    'p95_seconds': round(percentile(seconds, 0.95), 4),
+                    'max_seconds': round(max(seconds), 4),
+                }
+                for stage, seconds in self._stage_seconds.items()
+            }
+
+        slowest = sorted(leagues, key=lambda league: league['seconds'], reverse=True)[:top]
+        done = sum(1 for league in leagues if league['status'] == 'done')
+        return {
+            'run_id': os.path.basename(os.path.normpath(self.run_dir)),
+            'started_at': self.started_at,
+            'elapsed_seconds': round(elapsed, 3),
+            'leagues_done': done,
+            'leagues_failed': len(leagues) - done,
+            'leagues_per_minute': round(len(leagues) / elapsed * 60, 2) if elapsed and leagues else None,
+            'rows': sum(league.get('rows') or 0 for league in leagues if league['status'] == 'done'),
+            'bytes': sum(league['bytes'] for league in leagues),
+            'stages': dict(sorted(stages.items(), key=lambda item: item[1]['total_seconds'], reverse=True)),
+            'slowest_leagues': [
+                {
+                    'league': league['name'],
+                    'tier': league['tier'],
+                    'status': league['status'],
+                    'seconds': round(league['seconds'], 3),
+                    'bytes': league['bytes'],
+                    'rows': league.get('rows'),
+                    'columns': league.get('columns'),
+                    'slowest_stage': max(league['stages'], key=league['stages'].get) if league['stages'] else None,
+                }
+                for league in slowest
+            ],
+        }
+
+    def close(self):
+        """Write the run summary next to the event log and return it"""
+        summary = self.summary()
+        self.emit('run_finished', **{k: v for k, v in summary.items() if not isinstance(v, (dict, list))})
+        with self._lock:
+            self._file.close()
+
+        path = os.path.join(self.run_dir, self.SUMMARY_FILENAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return summary
+
+
+# Metrics of the current run, set up by main(); None records nothing
+METRICS = None
+
+
+@contextmanager
+def timed_stage(stage, **fields):
+    """
+    Time a with-block as one stage of the current league in the run metrics.
+    The yielded dict takes sizes (bytes, rows, ...) to record along with it.
+    """
+    extra = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield extra
+    except BaseException as e:
+        extra['error'] = type(e).__name__
+        raise
+    finally:
+        if METRICS is not None:
+            METRICS.stage(stage, time.perf_counter() - start, **extra)
+
+
+class CappedRetry(Retry):
+    """
+    urllib3 Retry that reads Retry-After like the async engine (retry_after_seconds):
+    fractional seconds are accepted, the wait is at most MAX_RETRY_AFTER, and a
+    header it can't read means the async engine's backoff instead of an error
+    """
+
+    def parse_retry_after(self, retry_after):
+        seconds = retry_after_seconds(retry_after)
+        # The response being retried is already in the history
+        return backoff_delay(max(0, len(self.history) - 1)) if seconds is None else seconds
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size=DEFAULT_WORKERS):
+    """
+    Return the shared requests session, creating it on first use. Connections are
+    kept alive and pooled per host, and 429/5xx responses are retried with backoff
+    (honouring Retry-After, up to MAX_RETRY_AFTER).
+    """
+    global _http_session
+
+    with _http_session_lock:
+        if _http_session is None:
+            retry = CappedRetry(total=HTTP_RETRIES, backoff_factor=BACKOFF_FACTOR, status_forcelist=RETRY_STATUSES,
+                                allowed_methods=["GET"], respect_retry_after_header=True)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+            session = requests.Session()
+            session.headers.update(HTTP_HEADERS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session = session
+
+        return _http_session
+
+
+def backoff_delay(attempt):
+    """Seconds to wait before retrying after failed attempt number `attempt` (from 0)"""
+    return BACKOFF_FACTOR * 2 ** attempt
+
+
+def fetch_page_http(url, timeout=DEFAULT_PAGE_TIMEOUT):
+    """
+    Fetch a page's server HTML through the shared session, within the host's rate limit.
+    Fresh cached copies are returned without a request; stale ones are revalidated.
+    The session retries 429/5xx responses; bodies cut off before their end are
+    retried here, with the same backoff.
+    """
+    entry = PAGE_CACHE.lookup(url) if PAGE_CACHE else None
+    if entry is not None and PAGE_CACHE.is_fresh(entry):
+        with timed_stage('fetch', url=url, cache='hit') as stage:
+            body = PAGE_CACHE.read_body(entry)
+            stage['bytes'] = len(body.encode('utf-8'))
+        return body
+
+    headers = PageCache.validators(entry) if entry is not None else {}
+
+    for attempt in range(HTTP_RETRIES + 1):
+        with timed_stage('rate_limit_wait', url=url):
+            RATE_LIMITER.wait(url)
+
+        with timed_stage('fetch', url=url, attempt=attempt) as stage:
+            try:
+                response = get_http_session().get(url, headers=headers, timeout=timeout)
+            except (requests.exceptions.ChunkedEncodingError, http.client.IncompleteRead) as e:
+                if attempt == HTTP_RETRIES:
+                    raise
+                stage['truncated'] = True
+                delay = backoff_delay(attempt)
+                print(f"   Truncated response for {url} ({e}), retrying in {delay:.0f}s")
+            else:
+                stage['status'] = response.status_code
+                retries = getattr(response.raw, 'retries', None)
+                stage['retries'] = len(retries.history) if retries is not None else 0
+
+                if response.status_code == 304 and entry is not None:
+                    PAGE_CACHE.touch(url, entry, response.headers)
+                    body = PAGE_CACHE.read_body(entry)
+                    stage.update(cache='revalidated', bytes=len(body.encode('utf-8')))
+                    return body
+
+                if is_missing_status(response.status_code):
+                    raise MissingPage(f"HTTP {response.status_code} for {url}")
+                response.raise_for_status()
+                stage.update(cache='miss', bytes=len(response.content))
+                if PAGE_CACHE:
+                    PAGE_CACHE.store(url, response.text, response.headers)
+                return response.text
+
+        with timed_stage('retry_wait', url=url, attempt=attempt):
+            time.sleep(delay)
+
+
+def read_rendered_page(url):
+    """Return a fresh cached Selenium page source for the URL, or None"""
+    return PAGE_CACHE.get_fresh(url, kind='rendered') if PAGE_CACHE else None
+
+
+def store_rendered_page(url, page_source):
+    if PAGE_CACHE:
+        PAGE_CACHE.store(url, page_source, kind='rendered')
+
+
+def load_page(driver, url, ready_selector, timeout=DEFAULT_PAGE_TIMEOUT):
+    """
+    Open a URL once the host's rate limit allows it and wait until an element
+    matching `ready_selector` is in the DOM. Returns False if it never appeared.
+    """
+    with timed_stage('rate_limit_wait', url=url):
+        RATE_LIMITER.wait(url)
+
+    with timed_stage('page_load', url=url) as stage:
+        driver.get(url)
+
+        if LEAN_DRIVER:
+            # Scripts are blocked, so the DOM is final once get() returns; tables FBRef
+            # ships inside comments stay there and are read from the comments when parsing
+            stage['ready'] = bool(driver.find_elements(By.CSS_SELECTOR, ready_selector)
+                                  or driver.execute_script(COMMENTED_ELEMENT_SCRIPT, ready_selector))
+            if not stage['ready']:
+                print(f"No page data in the loaded page: {url}")
+            return stage['ready']
+
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+            stage['ready'] = True
+            return True
+        except TimeoutException:
+            print(f"Timed out after {timeout}s waiting for page data: {url}")
+            stage['ready'] = False
+            return False
+
+
+class DriverPool:
+    """
+    Pool of long-lived Chrome drivers built with setup_driver(), shared between
+    scraping workers so Chrome is started once per worker instead of once per league.
+    With DRIVER_PROFILE_DIR set, every slot of the pool owns a persistent profile
+    (<dir>/driver-<n>) that a replacement driver in the same slot starts from.
+    """
 
-    driver = setup_driver()
+    def __init__(self, size=DEFAULT_WORKERS):
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._free_slots = list(range(self.size))
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Return an idle driver, starting a new one while the pool is below its size"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = len(self._drivers) < self.size
+                if can_create:
+                    # Reserve the slot before the (slow) Chrome startup
+                    self._drivers.append(None)
+                    slot = self._free_slots.pop(0)
+
+            if can_create:
+                break
+
+            # Wake up periodically in case a dead driver freed a slot
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+        try:
+            driver = setup_driver(os.path.join(DRIVER_PROFILE_DIR, f"driver-{slot}") if DRIVER_PROFILE_DIR else None)
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+                self._free_slots.append(slot)
+            raise
+
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+            self._slots[driver] = slot
+        return driver
+
+    def release(self, driver):
+        """Give a driver back to the pool, replacing it if Chrome has died"""
+        if self._is_alive(driver):
+            self._idle.put(driver)
+            return
+
+        print("   Driver is no longer responding, discarding it")
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            if driver in self._slots:
+                self._free_slots.append(self._slots.pop(driver))
+        try:
+            driver.quit()
+        except:
+            pass
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for the duration of a with-block"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every driver started by the pool"""
+        with self._lock:
+            drivers = [d for d in self._drivers if d is not None]
+            self._drivers = []
+            self._free_slots = list(range(self.size))
+            self._slots = {}
+        self._idle = queue.Queue()
+
+        for driver in drivers:
+            try:
+                driver.quit()
+            except:
+                pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+def parse_competitions_page(page_source, base_url=DEFAULT_BASE_URL):
+    """
+    Parse FBRef's competitions page into {tier: {league name: stats URL}},
+    keeping only the domestic league tables of the 1st, 2nd and 3rd tier sections
+    """
     leagues_by_tier = {
         'Tier 1': {},
         'Tier 2': {},
         'Tier 3': {}
     }
 
+    soup = BeautifulSoup(page_source, 'html.parser')
+
+    # Find all tables on the page
+    tables = soup.find_all('table')
+
+    # Look for tables that contain domestic league information
+    # We'll identify them by looking for preceding headers or context
+
+    current_tier = None
+
+    # Find all elements and process them in order to maintain context
+    all_elements = soup.find_all(['h2', 'h3', 'h4', 'table'])
+
+    for element in all_elements:
+        if element.name in ['h2', 'h3', 'h4']:
+            header_text = element.get_text().strip().lower()
+
+            # Identify which tier section we're in
+            if 'domestic leagues - 1st tier' in header_text or 'domestic leagues-1st tier' in header_text:
+                current_tier = 'Tier 1'
+                print(f"Found Tier 1 section: {element.get_text().strip()}")
+            elif 'domestic leagues - 2nd tier' in header_text or 'domestic leagues-2nd tier' in header_text:
+                current_tier = 'Tier 2'
+                print(f"Found Tier 2 section: {element.get_text().strip()}")
+            elif ('domestic leagues - 3rd tier' in header_text or
+                  'domestic leagues-3rd tier' in header_text or
+                  '3rd tier and lower' in header_text):
+                current_tier = 'Tier 3'
+                print(f"Found Tier 3 section: {element.get_text().strip()}")
+            elif ('international' in header_text or
+                  'continental' in header_text or
+                  'women' in header_text or
+                  'youth' in header_text):
+                current_tier = None  # Reset when we hit non-domestic sections
+
+        elif element.name == 'table' and current_tier:
+            # Process this table as it belongs to a domestic tier
+            print(f"Processing table in {current_tier} section")
+
+            links = element.find_all('a', href=True)
+
+            for link in links:
+                href = link.get('href', '')
+                text = link.text.strip()
+
+                # Look for competition links
+                if '/comps/' in href and text and len(text) > 3:
+                    # Extract competition ID
+                    comp_match = re.search(r'/comps/(\d+)/', href)
+                    if comp_match:
+                        comp_id = comp_match.group(1)
+
+                        # Skip year-only entries (like "2024-2025", "2025", etc.)
+                        if re.match(r'^\d{4}(-\d{4})?$', text):
+                            continue
+
+                        # Skip single years
+                        if re.match(r'^\d{4}$', text):
+                            continue
+
+                        # Skip cup competitions and tournaments
+                        if any(cup_keyword in text.lower() for cup_keyword in [
+                            'cup', 'copa', 'coupe', 'pokal', 'trophy', 'trophée', 'shield',
+                            'supercup', 'qualification', 'playoff', 'championship playoff'
+                        ]):
+                            continue
+
+                        # Skip clearly international competitions
+                        if any(exclude in text.lower() for exclude in [
+                            'champions league', 'europa league', 'conference league',
+                            'world cup', 'euro', 'copa america', 'nations league',
+                            'uefa', 'fifa', 'international', 'olympics', 'libertadores',
+                            'concacaf', 'afc', 'caf', 'cup of nations'
+                        ]):
+                            continue
+
+                        # Only include if it looks like a proper league name
+                        # Must contain actual words, not just numbers/symbols
+                        if (len([word for word in text.split() if word.isalpha()]) >= 1 and
+                                not text.lower().startswith('matchday') and
+                                not text.lower().startswith('round')):
+                            # Construct stats URL
+                            league_name = text.strip()
+                            stats_url = f"{base_url}/en/comps/{comp_id}/stats/{league_name.replace(' ', '-')}-Stats"
+
+                            leagues_by_tier[current_tier][league_name] = {
+                                'url': stats_url,
+                                'comp_id': comp_id
+                            }
+
+                            print(f"  Added to {current_tier}: {league_name}")
+
+    # Clean up and remove duplicates based on competition ID
+    for tier in leagues_by_tier:
+        cleaned_leagues = {}
+        seen_comp_ids = set()
+
+        for name, info in leagues_by_tier[tier].items():
+            comp_id = info['comp_id']
+            if comp_id not in seen_comp_ids:
+                seen_comp_ids.add(comp_id)
+                cleaned_leagues[name] = info['url']
+
+        leagues_by_tier[tier] = cleaned_leagues
+
+    return leagues_by_tier
+
+
+def discover_domestic_leagues_by_tier(page_timeout=DEFAULT_PAGE_TIMEOUT, fetch_mode='http',
+                                      base_url=DEFAULT_BASE_URL):
+    """
+    Discover domestic leagues from FBRef's competitions page, specifically from the
+    1st Tier, 2nd Tier, and 3rd Tier and Lower sections
+    """
+    print("Discovering domestic leagues from FBRef competitions page...")
+
+    base_url = base_url.rstrip('/')
+    competitions_url = f"{base_url}/en/comps/"
+
     try:
-        driver.get(competitions_url)
-        time.sleep(3)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # Find all tables on the page
-        tables = soup.find_all('table')
-
-        # Look for tables that contain domestic league information
-        # We'll identify them by looking for preceding headers or context
-
-        current_tier = None
-
-        # Find all elements and process them in order to maintain context
-        all_elements = soup.find_all(['h2', 'h3', 'h4', 'table'])
-
-        for element in all_elements:
-            if element.name in ['h2', 'h3', 'h4']:
-                header_text = element.get_text().strip().lower()
-
-                # Identify which tier section we're in
-                if 'domestic leagues - 1st tier' in header_text or 'domestic leagues-1st tier' in header_text:
-                    current_tier = 'Tier 1'
-                    print(f"Found Tier 1 section: {element.get_text().strip()}")
-                elif 'domestic leagues - 2nd tier' in header_text or 'domestic leagues-2nd tier' in header_text:
-                    current_tier = 'Tier 2'
-                    print(f"Found Tier 2 section: {element.get_text().strip()}")
-                elif ('domestic leagues - 3rd tier' in header_text or
-                      'domestic leagues-3rd tier' in header_text or
-                      '3rd tier and lower' in header_text):
-                    current_tier = 'Tier 3'
-                    print(f"Found Tier 3 section: {element.get_text().strip()}")
-                elif ('international' in header_text or
-                      'continental' in header_text or
-                      'women' in header_text or
-                      'youth' in header_text):
-                    current_tier = None  # Reset when we hit non-domestic sections
-
-            elif element.name == 'table' and current_tier:
-                # Process this table as it belongs to a domestic tier
-                print(f"Processing table in {current_tier} section")
-
-                links = element.find_all('a', href=True)
-
-                for link in links:
-                    href = link.get('href', '')
-                    text = link.text.strip()
-
-                    # Look for competition links
-                    if '/comps/' in href and text and len(text) > 3:
-                        # Extract competition ID
-                        comp_match = re.search(r'/comps/(\d+)/', href)
-                        if comp_match:
-                            comp_id = comp_match.group(1)
-
-                            # Skip year-only entries (like "2024-2025", "2025", etc.)
-                            if re.match(r'^\d{4}(-\d{4})?$', text):
-                                continue
-
-                            # Skip single years
-                            if re.match(r'^\d{4}$', text):
-                                continue
-
-                            # Skip cup competitions and tournaments
-                            if any(cup_keyword in text.lower() for cup_keyword in [
-                                'cup', 'copa', 'coupe', 'pokal', 'trophy', 'trophée', 'shield',
-                                'supercup', 'qualification', 'playoff', 'championship playoff'
-                            ]):
-                                continue
-
-                            # Skip clearly international competitions
-                            if any(exclude in text.lower() for exclude in [
-                                'champions league', 'europa league', 'conference league',
-                                'world cup', 'euro', 'copa america', 'nations league',
-                                'uefa', 'fifa', 'international', 'olympics', 'libertadores',
-                                'concacaf', 'afc', 'caf', 'cup of nations'
-                            ]):
-                                continue
-
-                            # Only include if it looks like a proper league name
-                            # Must contain actual words, not just numbers/symbols
-                            if (len([word for word in text.split() if word.isalpha()]) >= 1 and
-                                    not text.lower().startswith('matchday') and
-                                    not text.lower().startswith('round')):
-                                # Construct stats URL
-                                league_name = text.strip()
-                                stats_url = f"{base_url}/en/comps/{comp_id}/stats/{league_name.replace(' ', '-')}-Stats"
-
-                                leagues_by_tier[current_tier][league_name] = {
-                                    'url': stats_url,
-                                    'comp_id': comp_id
-                                }
-
-                                print(f"  Added to {current_tier}: {league_name}")
-
-        driver.quit()
-
-        # Clean up and remove duplicates based on competition ID
-        for tier in leagues_by_tier:
-            cleaned_leagues = {}
-            seen_comp_ids = set()
-
-            for name, info in leagues_by_tier[tier].items():
-                comp_id = info['comp_id']
-                if comp_id not in seen_comp_ids:
-                    seen_comp_ids.add(comp_id)
-                    cleaned_leagues[name] = info['url']
-
-            leagues_by_tier[tier] = cleaned_leagues
+        leagues_by_tier = None
+
+        # The competitions tables are in the server HTML, so try a plain request first
+        if fetch_mode == 'http':
+            try:
+                leagues_by_tier = parse_competitions_page(fetch_page_http(competitions_url, page_timeout), base_url)
+            except Exception as e:
+                print(f"HTTP fetch of competitions page failed: {str(e)}")
+
+        if not leagues_by_tier or not any(leagues_by_tier.values()):
+            if fetch_mode == 'http':
+                print("Falling back to Selenium for the competitions page")
+            page_source = read_rendered_page(competitions_url)
+            if page_source is None:
+                driver = setup_driver()
+                try:
+                    ready = load_page(driver, competitions_url, COMPETITIONS_TABLE_SELECTOR, page_timeout)
+                    page_source = driver.page_source
+                finally:
+                    driver.quit()
+                if ready:
+                    store_rendered_page(competitions_url, page_source)
+            leagues_by_tier = parse_competitions_page(page_source, base_url)
 
         # Print summary
         total_leagues = sum(len(leagues_by_tier[tier]) for tier in leagues_by_tier)
@@ -183,255 +983,1257 @@ def discover_domestic_leagues_by_tier():
 
     except Exception as e:
         print(f"Error discovering domestic leagues: {str(e)}")
-        try:
-            driver.quit()
-        except:
-            pass
         return {'Tier 1': {}, 'Tier 2': {}, 'Tier 3': {}}
 
 
-def scrape_fbref_players_selenium(league_url, league_name):
+def history_url(league_url):
+    """URL of a competition's history page, which lists all its seasons, from its stats URL"""
+    return re.sub(r'/stats/([^/]+)-Stats$', r'/history/\1-Seasons', league_url)
+
+
+def parse_season_history(page_source, base_url=DEFAULT_BASE_URL):
+    """
+    Parse a competition's history page into [(season, stats URL)], newest first.
+    Season links point at the season's overview page; its player stats are under
+    the stats/ path of the same page name.
+    """
+    root = lxml.html.fromstring(page_source, parser=HTML_PARSER)
+    seasons = {}
+    for link in root.xpath("//table[@id='seasons']//*[@data-stat='year_id']//a[@href]"):
+        season = link.text_content().strip()
+        if SEASON_PATTERN.match(season) and season not in seasons:
+            head, _, page = urljoin(f"{base_url}/", link.get('href')).rpartition('/')
+            seasons[season] = f"{head}/stats/{page}"
+    return list(seasons.items())
+
+
+def fetch_season_history(pool, league_url, page_timeout=DEFAULT_PAGE_TIMEOUT, fetch_mode='http'):
+    """HTML of a competition's history page, rendered in Chrome only when a plain request fails"""
+    url = history_url(league_url)
+    if fetch_mode == 'http':
+        try:
+            return fetch_page_http(url, page_timeout)
+        except Exception as e:
+            print(f"HTTP fetch of {url} failed: {str(e)}")
+
+    page_source = read_rendered_page(url)
+    if page_source is None:
+        with pool.driver() as driver:
+            ready = load_page(driver, url, SEASONS_TABLE_SELECTOR, page_timeout)
+            page_source = driver.page_source
+        if ready:
+            store_rendered_page(url, page_source)
+    return page_source
+
+
+def discover_past_seasons(leagues_by_tier, archive, max_seasons=DEFAULT_BACKFILL_SEASONS, workers=DEFAULT_WORKERS,
+                          page_timeout=DEFAULT_PAGE_TIMEOUT, fetch_mode='http', base_url=DEFAULT_BASE_URL):
+    """
+    Find the completed seasons of every league that the archive doesn't hold yet,
+    as {(tier, league name): {season: stats URL}}. History pages are fetched on a
+    pool of `workers` threads under the shared per-host budget. A league's newest
+    season is still being played, so it is left to regular runs; `max_seasons`
+    (0 = all) limits each league to its most recent completed seasons.
+    """
+    print("\nDiscovering past seasons from the competition history pages...")
+    base_url = base_url.rstrip('/')
+    pool = DriverPool(workers)
+
+    def league_seasons(tier, league_name, league_url):
+        try:
+            history = parse_season_history(fetch_season_history(pool, league_url, page_timeout, fetch_mode), base_url)
+        except Exception as e:
+            print(f"❌ Failed to read the seasons of {league_name}: {str(e)}")
+            return {}
+
+        completed = history[1:max_seasons + 1] if max_seasons else history[1:]
+        pending = {season: url for season, url in completed if not archive.has(season, tier, league_name)}
+        print(f"  {league_name} ({tier}): {len(pending)} of {len(completed)} completed seasons to backfill")
+        return pending
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                (tier, league_name): executor.submit(league_seasons, tier, league_name, league_url)
+                for tier in ['Tier 1', 'Tier 2', 'Tier 3']
+                for league_name, league_url in leagues_by_tier.get(tier, {}).items()
+            }
+            return {league: future.result() for league, future in futures.items()}
+    finally:
+        pool.close()
+
+
+def category_url(league_url, category):
+    """URL of a league's page for a stats category, from its standard stats URL"""
+    segment = STAT_CATEGORIES[category][0]
+    return re.sub(r'/stats/([^/]+)$', rf'/{segment}/\1', league_url)
+
+
+def category_table_xpath(category):
+    """XPath of a stats category's player table"""
+    table_ids = STAT_CATEGORIES[category][1]
+    return "//table[" + " or ".join(f"contains(@id, '{table_id}')" for table_id in table_ids) + "]"
+
+
+def category_ready_selector(category):
+    """CSS selector whose presence means a category page is ready to be parsed"""
+    return ", ".join(f"table[id*='{table_id}']" for table_id in STAT_CATEGORIES[category][1])
+
+
+def find_stats_table(root, category='standard'):
+    """
+    Return the player table of a stats category (stats_standard/stats_players for
+    the standard stats) from a parsed lxml page.
+    FBRef ships some tables inside HTML comments and only un-comments them with
+    JavaScript, so commented-out markup is searched too when raw HTML is parsed.
+    """
+    table_xpath = category_table_xpath(category)
+    tables = root.xpath(table_xpath)
+    if tables:
+        return tables[0]
+
+    for comment in root.xpath('//comment()'):
+        text = comment.text or ''
+        if any(table_id in text for table_id in STAT_CATEGORIES[category][1]):
+            tables = lxml.html.fromstring(f"<div>{text}</div>", parser=HTML_PARSER).xpath(table_xpath)
+            if tables:
+                return tables[0]
+
+    return None
+
+
+def stats_table_columns(table):
+    """
+    Map each data-stat of the table header to a flattened column name, joining the
+    over-header group with the column label ("Performance" + "Gls" -> "Performance Gls")
     """
-    Scrape player data from FBRef for a specific league
+    header_rows = table.xpath('./thead/tr')
+    if not header_rows:
+        return {}
+
+    # Expand the over-header groups across the columns they span
+    groups = []
+    for row in header_rows[:-1]:
+        if 'over_header' in (row.get('class') or ''):
+            for cell in row.xpath('./th|./td'):
+                groups.extend([cell.text_content().strip()] * int(cell.get('colspan') or 1))
+
+    columns = {}
+    for i, cell in enumerate(header_rows[-1].xpath('./th|./td')):
+        stat = cell.get('data-stat')
+        if not stat:
+            continue
+        group = groups[i] if i < len(groups) else ''
+        columns[stat] = f"{group} {cell.text_content().strip()}".strip()
+    return columns
+
+
+def extract_stats_table(table):
+    """
+    Read an FBRef stats table in a single pass over its rows, keyed by each cell's
+    data-stat so values can never end up in the wrong row or column.
+    Player, nationality and team come from the cell links, and the player link
+    also gives a 'Player ID' column. Every value is left as text; apply_schema
+    converts the stat columns afterwards.
+    """
+    columns = stats_table_columns(table)
+    values = {stat: [] for stat in columns}
+    player_ids = []
+
+    for row in table.xpath('./tbody/tr'):
+        # Skip the header rows repeated inside the body and spacer rows
+        row_class = row.get('class') or ''
+        if 'thead' in row_class or 'over_header' in row_class or 'spacer' in row_class:
+            continue
+
+        cells = {cell.get('data-stat'): cell for cell in row.xpath('./th|./td')}
+        player_cell = cells.get('player')
+        if player_cell is None or player_cell.tag != 'td':
+            continue
+
+        for stat, column in values.items():
+            cell = cells.get(stat)
+            if cell is None:
+                column.append(None)
+            elif stat in ('player', 'team'):
+                links = cell.xpath('.//a')
+                text = (links[0] if links else cell).text_content()
+                column.append(text if text else 'N/A')
+                if stat == 'player':
+                    match = PLAYER_ID_PATTERN.search(links[0].get('href') or '') if links else None
+                    player_ids.append(match.group(1) if match else cell.get('data-append-csv'))
+            elif stat == 'nationality':
+                # e.g. "eng ENG" - the country code is the last word
+                words = cell.text_content().split()
+                column.append(words[-1] if words else 'N/A')
+            else:
+                column.append(cell.text_content().strip())
+
+    df = pd.DataFrame({columns[stat]: column for stat, column in values.items()})
+    if 'player' in columns:
+        df.insert(df.columns.get_loc(columns['player']) + 1, 'Player ID', player_ids)
+
+    return df
+
+
+def lap(timings, stage, start):
+    """Record the seconds since `start` as `stage` in a timings dict (if any); returns now"""
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = now - start
+    return now
+
+
+class UnchangedLeague:
+    """
+    Stand-in for a league's DataFrame when its stats table matches the stored
+    fingerprint. Keeps the page it was found on, so the table can still be
+    extracted without fetching the page again when another category changed.
+    """
+
+    def __init__(self, fingerprint, page_source=None):
+        self.fingerprint = fingerprint
+        self.page_source = page_source
+
+
+# Whether every parsed stats table is fingerprinted for the manifest, so that a later
+# --refresh can skip leagues whose tables are unchanged; set by --refresh and
+# --fingerprint. Tables compared with a stored fingerprint are always fingerprinted.
+RECORD_FINGERPRINTS = False
+
+
+def table_fingerprint(table):
+    """SHA-256 of a stats table's markup; equal fingerprints mean nothing in the table changed"""
+    return hashlib.sha256(lxml.html.tostring(table, encoding='utf-8', with_tail=False)).hexdigest()
+
+
+def parse_league_page(page_source, league_name, timings=None, stored_fingerprint=None, category='standard',
+                      record_fingerprint=False):
+    """
+    Build the player DataFrame for a league from the HTML of its stats page (or its
+    page for another stats category).
+    Returns None when the page has no usable stats table. With `record_fingerprint`
+    or a `stored_fingerprint` the table's fingerprint is kept in
+    df.attrs['fingerprint'] (otherwise None); when it equals `stored_fingerprint`
+    the table is not extracted at all and an UnchangedLeague is returned instead.
+    The seconds spent in each stage are added to `timings` when a dict is given.
+    """
+    start = time.perf_counter()
+    root = lxml.html.fromstring(page_source, parser=HTML_PARSER)
+    start = lap(timings, 'html_parse', start)
+
+    # Find the main player stats table
+    table = find_stats_table(root, category)
+    start = lap(timings, 'find_table', start)
+
+    if table is None:
+        print(f"No suitable {category} stats table found for {league_name}")
+        return None
+
+    # Serializing and hashing the table is only worth it when it is compared or kept
+    fingerprint = None
+    if record_fingerprint or stored_fingerprint is not None:
+        fingerprint = table_fingerprint(table)
+        start = lap(timings, 'fingerprint', start)
+        if fingerprint == stored_fingerprint:
+            print(f"{category.capitalize()} stats table for {league_name} is unchanged")
+            return UnchangedLeague(fingerprint, page_source)
+
+    columns = stats_table_columns(table)
+    if 'player' not in columns:
+        print(f"Stats table for {league_name} has no player column")
+        return None
+
+    df = extract_stats_table(table)
+    start = lap(timings, 'extract', start)
+    print(f"Found {len(df)} data rows")
+
+    # Identity columns first, under the dataset's names
+    df = df.rename(columns={
+        columns['player']: 'Player',
+        columns.get('nationality'): 'Nationality',
+        columns.get('team'): 'Team',
+    })
+    df = clean_league_frame(df)
+
+    identity = [col for col in ['Player', 'Player ID', 'Nationality', 'Team'] if col in df.columns]
+    df = df[identity + [col for col in df.columns if col not in identity]]
+    df.insert(0, 'League', league_name)  # Add league identifier
+    start = lap(timings, 'clean', start)
+
+    # One vectorized conversion per column to the declared types
+    df, report = apply_schema(df, category)
+    df.attrs['fingerprint'] = fingerprint
+    lap(timings, 'coerce', start)
+    summary = describe_schema_report(report)
+    if summary:
+        print(f"⚠️  {category.capitalize()} stats table for {league_name} differs from its schema: {summary}")
+
+    return df
+
+
+def parse_league_page_timed(page_source, league_name, stored_fingerprint=None, category='standard',
+                            record_fingerprint=False):
+    """parse_league_page plus the seconds spent in each of its stages; runs in worker processes too"""
+    timings = {}
+    return (parse_league_page(page_source, league_name, timings, stored_fingerprint, category, record_fingerprint),
+            timings)
+
+
+def record_parse_timings(timings, page_source, league_data):
+    """Add the parsing stages of one page to the run metrics, with the page size and the table's shape"""
+    if METRICS is None:
+        return
+
+    sizes = {'html_parse': {'bytes': len(page_source.encode('utf-8'))}}
+    if isinstance(league_data, pd.DataFrame):
+        sizes['clean'] = {'rows': len(league_data), 'columns': len(league_data.columns)}
+    for stage, seconds in timings.items():
+        METRICS.stage(stage, seconds, **sizes.get(stage, {}))
+
+
+def parse_league_page_with_metrics(page_source, league_name, stored_fingerprint=None, category='standard'):
+    """parse_league_page, recording its stages in the run metrics"""
+    league_data, timings = parse_league_page_timed(page_source, league_name, stored_fingerprint, category,
+                                                   RECORD_FINGERPRINTS)
+    record_parse_timings(timings, page_source, league_data)
+    return league_data
+
+
+def scrape_fbref_players_selenium(league_url, league_name, driver=None, page_timeout=DEFAULT_PAGE_TIMEOUT,
+                                  stored_fingerprint=None, category='standard'):
+    """
+    Scrape player data from FBRef for a specific league (from `league_url`, its page
+    for the given stats category).
+    If a driver is given (e.g. borrowed from a DriverPool) it is left running,
+    otherwise a driver is started for this league and quit afterwards.
     """
     print(f"Starting scrape for {league_name}...")
 
-    driver = setup_driver()
+    page_source = read_rendered_page(league_url)
+    if page_source is not None:
+        print(f"Using cached page for {league_name}")
+        return parse_league_page_with_metrics(page_source, league_name, stored_fingerprint, category)
+
+    owns_driver = driver is None
+    if owns_driver:
+        driver = setup_driver()
 
     try:
-        driver.get(league_url)
-        time.sleep(5)  # Wait for page to fully load
+        # Parse as soon as the stats table is in the DOM; a page that came without it
+        # is loaded once more, and is never cached
+        ready = (load_page(driver, league_url, category_ready_selector(category), page_timeout)
+                 or load_page(driver, league_url, category_ready_selector(category), page_timeout))
 
         # Get page source - no need for explicit encoding since Selenium handles it
-        page_source = driver.page_source
-        # Create BeautifulSoup object without specifying from_encoding
-        soup = BeautifulSoup(page_source, 'html.parser')
-        driver.quit()
-
-        # Find the main player stats table
-        table = None
-        for t in soup.find_all('table'):
-            tid = t.get('id', '')
-            if 'stats_players' in tid or 'stats_standard' in tid:
-                table = t
-                break
+        with timed_stage('page_source', url=league_url) as stage:
+            page_source = driver.page_source
+            stage['bytes'] = len(page_source.encode('utf-8'))
+        if owns_driver:
+            driver.quit()
+        if ready:
+            store_rendered_page(league_url, page_source)
+
+        return parse_league_page_with_metrics(page_source, league_name, stored_fingerprint, category)
+
+    except Exception as e:
+        print(f"Error scraping {league_name}: {str(e)}")
+        if owns_driver:
+            try:
+                driver.quit()
+            except:
+                pass
+        return None
+
+
+def scrape_fbref_players_http(league_url, league_name, timeout=DEFAULT_PAGE_TIMEOUT, stored_fingerprint=None,
+                              category='standard'):
+    """
+    Scrape player data for a league from the raw server HTML, without a browser.
+    Returns None if the request fails or the page has no usable stats table, and
+    raises MissingPage when the server says there is no such page.
+    """
+    print(f"Starting HTTP scrape for {league_name}...")
+
+    try:
+        return parse_league_page_with_metrics(fetch_page_http(league_url, timeout), league_name,
+                                              stored_fingerprint, category)
+    except MissingPage:
+        raise
+    except Exception as e:
+        print(f"HTTP scrape failed for {league_name}: {str(e)}")
+        return None
+
+
+def league_key(tier, league_name):
+    """Filesystem-safe identifier of a league, used for its shard and manifest entry"""
+    return re.sub(r'[^\w]+', '-', f"{tier}__{league_name}".lower()).strip('-')
+
+
+class RunManifest:
+    """
+    Checkpoint of a scrape run, stored as manifest.json in the run directory.
+    Every league has an entry with status 'pending', 'done' or 'failed'; finished
+    leagues point at their shard (one CSV per league under shards/) and keep the
+    fingerprints of the stats tables it came from (one per stats category), so a
+    refresh can tell whether the tables changed since. The file is rewritten atomically after every change so a
+    crash never leaves it half-written.
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, run_dir, data):
+        self.run_dir = run_dir
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, run_dir, leagues_by_tier, categories=DEFAULT_CATEGORIES, seasons=None):
+        """
+        Start a new run with every discovered league pending. A backfill passes the
+        past seasons to fetch ({(tier, league name): {season: stats URL}}) and gets
+        an entry per league-season instead.
+        """
+        leagues = {}
+        for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
+            for league_name, league_url in leagues_by_tier.get(tier, {}).items():
+                targets = {None: league_url} if seasons is None else seasons.get((tier, league_name), {})
+                for season, url in targets.items():
+                    leagues[league_key(tier, league_name if season is None else f"{league_name} {season}")] = {
+                        'tier': tier,
+                        'league': league_name,
+                        'season': season,
+                        'url': url,
+                        'status': 'pending',
+                        'shard': None,
+                        'rows': None,
+                        'fingerprints': None,
+                        'error': None,
+                    }
+
+        now = datetime.now().isoformat(timespec='seconds')
+        manifest = cls(run_dir, {
+            'run_id': os.path.basename(os.path.normpath(run_dir)),
+            'created_at': now,
+            'updated_at': now,
+            'mode': 'current' if seasons is None else 'backfill',
+            'categories': list(categories),
+            'leagues': leagues,
+        })
+        os.makedirs(manifest.shard_dir, exist_ok=True)
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, run_dir):
+        with open(os.path.join(run_dir, cls.FILENAME), 'r', encoding='utf-8') as f:
+            manifest = cls(run_dir, json.load(f))
+        os.makedirs(manifest.shard_dir, exist_ok=True)
+        return manifest
+
+    @property
+    def shard_dir(self):
+        return os.path.join(self.run_dir, 'shards')
+
+    @property
+    def leagues(self):
+        return self.data['leagues']
+
+    def with_status(self, *statuses):
+        """(key, entry) pairs for leagues in any of the given states, in discovery order"""
+        return [(key, entry) for key, entry in self.leagues.items() if entry['status'] in statuses]
+
+    @property
+    def categories(self):
+        """Stats categories scraped in this run; runs from before categories only have the standard stats"""
+        return self.data.get('categories') or DEFAULT_CATEGORIES
+
+    def stored_fingerprints(self, key):
+        """Fingerprints of the stats tables behind a finished league's shard, by category"""
+        entry = self.leagues[key]
+        if entry['status'] != 'done':
+            return {}
+        if entry.get('fingerprints') is not None:
+            return entry['fingerprints']
+        # Manifests written before categories kept a single standard-table fingerprint
+        return {'standard': entry['fingerprint']} if entry.get('fingerprint') else {}
+
+    def begin_refresh(self):
+        """Clear the outcome of the previous refresh before every league is checked again"""
+        with self._lock:
+            for entry in self.leagues.values():
+                entry['refresh'] = None
+            self.data['refreshed_at'] = datetime.now().isoformat(timespec='seconds')
+            self.save()
+
+    def mark_done(self, key, league_data, fingerprints=None, **fields):
+        """Write the league's shard, then record it as done"""
+        shard = f"{key}.csv"
+        shard_path = os.path.join(self.shard_dir, shard)
+        tmp_path = f"{shard_path}.tmp"
+        league_data.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, shard_path)
+
+        self._update(key, status='done', shard=shard, rows=len(league_data), fingerprints=fingerprints,
+                     error=None, **fields)
+
+    def mark_unchanged(self, key):
+        """A refresh found the league's stats table as stored"""
+        self._update(key, refresh='unchanged', added=0, changed=0, error=None)
+
+    def mark_stale(self, key, error=None):
+        """A refresh of a finished league failed; its stored shard is kept"""
+        self._update(key, refresh='failed', error=error)
+
+    def mark_failed(self, key, error=None):
+        self._update(key, status='failed', shard=None, rows=None, fingerprints=None, error=error)
+
+    def read_shard(self, key):
+        """Load a finished league's shard exactly as it was written"""
+        return self.read_frame(os.path.join(self.shard_dir, self.leagues[key]['shard']))
+
+    @staticmethod
+    def read_frame(source):
+        """Read a shard (path or buffer) the way every shard is read, keeping player IDs as text"""
+        return pd.read_csv(source, encoding='utf-8', keep_default_na=False, na_values=[''],
+                           dtype={'Player ID': str})
+
+    def _update(self, key, **fields):
+        with self._lock:
+            self.leagues[key].update(fields, finished_at=datetime.now().isoformat(timespec='seconds'))
+            self.save()
+
+    def save(self):
+        self.data['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        path = os.path.join(self.run_dir, self.FILENAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def latest_run_dir(runs_dir=DEFAULT_RUNS_DIR):
+    """Most recently created run directory that has a manifest, or None"""
+    if not os.path.isdir(runs_dir):
+        return None
+
+    run_dirs = [os.path.join(runs_dir, name) for name in sorted(os.listdir(runs_dir))
+                if os.path.exists(os.path.join(runs_dir, name, RunManifest.FILENAME))]
+    return run_dirs[-1] if run_dirs else None
+
+
+def scrape_league_selenium_fallback(pool, league_url, league_name, page_timeout=DEFAULT_PAGE_TIMEOUT,
+                                    stored_fingerprint=None, category='standard'):
+    """Render a league page in Chrome, borrowing a driver only when no rendered copy is cached"""
+    if read_rendered_page(league_url) is not None:
+        return scrape_fbref_players_selenium(league_url, league_name, stored_fingerprint=stored_fingerprint,
+                                             category=category)
+
+    with pool.driver() as driver:
+        return scrape_fbref_players_selenium(league_url, league_name, driver=driver,
+                                             page_timeout=page_timeout, stored_fingerprint=stored_fingerprint,
+                                             category=category)
+
+
+def league_unchanged(results, stored_fingerprints):
+    """
+    True when every category page of a league matched its stored table: each
+    category is an UnchangedLeague, or missing now as it was missing before
+    (lower tiers don't have every category). The standard table must be there.
+    """
+    if set(results) != set(stored_fingerprints):
+        return False
+    return all(isinstance(result, UnchangedLeague)
+               or (result is None and category != 'standard' and stored_fingerprints[category] is None)
+               for category, result in results.items())
+
+
+def combine_categories(results, stored_fingerprints=None):
+    """
+    Build one league frame from its per-category results: the standard stats with
+    the other categories joined on as prefixed columns, one row per player-team
+    stint. Returns None without the standard stats, or when a category the stored
+    scrape had is missing now, so a refresh keeps the stored rows rather than
+    blanking that category's columns; a category missing all along is left out.
+    The fingerprint of every category table is kept in attrs['fingerprints'].
+    """
+    base = results.get('standard')
+    if base is None:
+        return None
+
+    lost = [category for category, frame in results.items()
+            if frame is None and (stored_fingerprints or {}).get(category)]
+    if lost:
+        print(f"   No {', '.join(lost)} stats this time")
+        return None
+
+    extras = {STAT_CATEGORIES[category][2]: frame for category, frame in results.items()
+              if category != 'standard' and frame is not None}
+    league_data = join_categories(base, extras)
+    league_data.attrs['fingerprints'] = {
+        category: None if frame is None else frame.attrs.get('fingerprint')
+        for category, frame in results.items()
+    }
+    return league_data
+
+
+def finish_league(league_data, tier, league_name, season=None):
+    """Label a scraped league with its tier (and season) and report it; passes None and UnchangedLeague through"""
+    if season is not None:
+        league_name = f"{league_name} {season}"
+
+    if league_data is None:
+        print(f"❌ Failed to scrape {league_name}")
+        return None
+
+    if isinstance(league_data, UnchangedLeague):
+        print(f"⏭️  {league_name} is unchanged, keeping its stored rows")
+        return league_data
+
+    # Add tier information
+    league_data.insert(1, 'Tier', tier)
+    if season is not None:
+        league_data.insert(2, 'Season', season)
+
+    print(f"✅ Successfully scraped {len(league_data)} players from {league_name}")
+    print(f"   DataFrame has {len(league_data.columns)} columns")
+    return league_data
 
-        if table is None:
-            print(f"No suitable stats table found for {league_name}")
+
+def scrape_league_category(pool, league_url, league_name, category, page_timeout=DEFAULT_PAGE_TIMEOUT,
+                           fetch_mode='http', stored_fingerprint=None):
+    """
+    Scrape a league's page for one stats category. In 'http' mode the raw page is
+    tried first and a driver is only borrowed from the pool if that fails - unless
+    the server says the page doesn't exist, when there is nothing to render.
+    """
+    page_url = category_url(league_url, category)
+
+    league_data = None
+    if fetch_mode == 'http':
+        try:
+            league_data = scrape_fbref_players_http(page_url, league_name, page_timeout, stored_fingerprint,
+                                                    category)
+        except MissingPage as e:
+            print(f"   No {category} stats page for {league_name} ({e})")
             return None
+        if league_data is None:
+            print(f"   Falling back to Selenium for {league_name} ({category})")
 
-        # Read table with pandas first using StringIO to avoid deprecation warning
-        from io import StringIO
-        df = pd.read_html(StringIO(str(table)))[0]
-
-        # Remove any duplicate/header rows within the data
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [' '.join(col).strip() for col in df.columns.values]
-
-        # Filter out rows that contain header text or are duplicates of column names
-        # This removes the repeated header rows that appear in the middle of tables
-        header_mask = df.apply(lambda row: row.astype(str).str.contains('Player|Rk|Age|Nation').any(), axis=1)
-        df = df[~header_mask].reset_index(drop=True)
-
-        # Extract player names and nationalities manually - PRESERVE ORIGINAL TEXT
-        player_names = []
-        nationalities = []
-        team_names = []
-        rows = table.find('tbody').find_all('tr')
-
-        # Filter out header rows and empty rows
-        data_rows = []
-        for row in rows:
-            # Skip if it's a header row or has thead class
-            if (row.get('class') and any('thead' in str(cls) for cls in row.get('class'))) or \
-                    row.find('th', {'data-stat': 'player'}):
-                continue
+    if league_data is None:
+        try:
+            league_data = scrape_league_selenium_fallback(pool, page_url, league_name, page_timeout,
+                                                          stored_fingerprint, category)
+        except Exception as e:
+            # Only the standard stats are essential; the league goes on without this category
+            if category == 'standard':
+                raise
+            print(f"❌ Failed to scrape {league_name} ({category}): {str(e)}")
+    return league_data
+
+
+def scrape_league_job(pool, tier, league_name, league_url, position, total_leagues,
+                      page_timeout=DEFAULT_PAGE_TIMEOUT, fetch_mode='http', stored_fingerprints=None,
+                      categories=DEFAULT_CATEGORIES, season=None):
+    """
+    Scrape every stats category of one league (or one past season of it), join
+    them and tidy up its columns.
+    Runs on a worker thread; returns the league DataFrame, UnchangedLeague when no
+    category table changed since the stored scrape, or None on failure.
+    """
+    label = league_name if season is None else f"{league_name} {season}"
+    print(f"\n[{position}/{total_leagues}] Processing {label} ({tier})...")
+
+    stored_fingerprints = stored_fingerprints or {}
+    results = {
+        category: scrape_league_category(pool, league_url, league_name, category, page_timeout, fetch_mode,
+                                         stored_fingerprints.get(category))
+        for category in categories
+    }
 
-            # Skip if no player data
-            player_cell = row.find('td', {'data-stat': 'player'})
-            if not player_cell:
-                continue
+    if league_unchanged(results, stored_fingerprints):
+        return finish_league(UnchangedLeague(stored_fingerprints.get('standard')), tier, league_name, season)
 
-            # Skip if this is a repeated header row (contains "Player" text)
-            if player_cell.text.strip() == 'Player':
-                continue
+    # Some table changed, so the unchanged ones are needed in full for the join;
+    # they are extracted from the pages already fetched
+    for category, result in results.items():
+        if isinstance(result, UnchangedLeague):
+            results[category] = parse_league_page_with_metrics(result.page_source, league_name, category=category)
 
-            data_rows.append(row)
-
-        print(f"Found {len(data_rows)} data rows, DataFrame has {len(df)} rows")
-
-        for row in data_rows:
-            # Get player name from the <a> inside data-stat="player" - PRESERVE ORIGINAL
-            player_cell = row.find('td', {'data-stat': 'player'})
-            player_name = 'N/A'
-            if player_cell:
-                a_tag = player_cell.find('a')
-                if a_tag:
-                    # Use string content directly to preserve encoding
-                    player_name = str(a_tag.string) if a_tag.string else a_tag.get_text(strip=False)
-                else:
-                    # Use string content directly to preserve encoding
-                    text_content = player_cell.get_text(strip=False)
-                    player_name = text_content if text_content else 'N/A'
-            player_names.append(player_name)
-
-            # Get nationality - PRESERVE ORIGINAL TEXT
-            nationality_cell = row.find('td', {'data-stat': 'nationality'})
-            nationality = 'N/A'
-            if nationality_cell:
-                # Look for the country code in nested spans
-                spans = nationality_cell.find_all('span')
-                if len(spans) >= 2:
-                    # Second span usually contains the country code - preserve original
-                    nationality = str(spans[1].string) if spans[1].string else spans[1].get_text(strip=False)
-                else:
-                    # Fallback to full text - preserve original
-                    nationality = nationality_cell.get_text(strip=False)
-            nationalities.append(nationality)
-
-            # Get team name - PRESERVE ORIGINAL TEXT
-            team_cell = row.find('td', {'data-stat': 'team'})
-            team_name = 'N/A'
-            if team_cell:
-                a_tag = team_cell.find('a')
-                if a_tag:
-                    # Use string content directly to preserve encoding
-                    team_name = str(a_tag.string) if a_tag.string else a_tag.get_text(strip=False)
-                else:
-                    # Use string content directly to preserve encoding
-                    text_content = team_cell.get_text(strip=False)
-                    team_name = text_content if text_content else 'N/A'
-            team_names.append(team_name)
-
-        # Adjust DataFrame length to match extracted data
-        if len(player_names) != len(df):
-            print(f"Adjusting DataFrame from {len(df)} to {len(player_names)} rows")
-            if len(player_names) < len(df):
-                df = df.head(len(player_names))
-            else:
-                # This shouldn't happen, but handle it gracefully
-                player_names = player_names[:len(df)]
-                nationalities = nationalities[:len(df)]
-                team_names = team_names[:len(df)]
-
-        # Ensure length matches before inserting
-        if len(player_names) == len(df) and len(nationalities) == len(df):
-            df.insert(0, 'Team', team_names)
-            df.insert(0, 'Nationality', nationalities)
-            df.insert(0, 'Player', player_names)
-            df.insert(0, 'League', league_name)  # Add league identifier
+    return finish_league(combine_categories(results, stored_fingerprints), tier, league_name, season)
+
+
+def upsert_into_shard(manifest, key, league_data):
+    """Upsert a fresh scrape into a finished league's shard; returns (merged, rows added, rows changed)"""
+    stored = manifest.read_shard(key)
+    # Read the fresh rows back the way the shard was read, so equal values compare equal
+    fresh = RunManifest.read_frame(io.StringIO(league_data.to_csv(index=False)))
+
+    if 'Player ID' not in stored.columns:
+        # Shard written before player IDs were scraped: there is nothing to match rows on
+        return fresh, len(fresh), 0
+    return upsert_rows(stored, fresh)
+
+
+def checkpoint_league(manifest, sinks, key, league_data, error=None):
+    """
+    Record a league's outcome in the run manifest and stream it into every output
+    of the combined dataset; returns True if it succeeded.
+
+    A league that already has a shard (i.e. when refreshing) never loses it: if
+    its table is unchanged or the scrape failed the stored rows are streamed as
+    they are, and a changed table only upserts its new and changed rows.
+    """
+    stored = manifest.leagues[key]['status'] == 'done'
+
+    if league_data is None and not stored:
+        manifest.mark_failed(key, error or "no data")
+        return False
+
+    with timed_stage('checkpoint') as stage:
+        if league_data is None:
+            manifest.mark_stale(key, error or "no data")
+            league_data = manifest.read_shard(key)
+        elif isinstance(league_data, UnchangedLeague):
+            manifest.mark_unchanged(key)
+            league_data = manifest.read_shard(key)
+        elif stored:
+            fingerprints = league_data.attrs.get('fingerprints')
+            league_data, added, changed = upsert_into_shard(manifest, key, league_data)
+            print(f"   {manifest.leagues[key]['league']}: {added} rows added, {changed} rows changed")
+            manifest.mark_done(key, league_data, fingerprints, refresh='updated', added=added, changed=changed)
+            stage.update(added=added, changed=changed)
         else:
-            print(f"Warning: Still have row count mismatch for {league_name}")
-            print(f"Players: {len(player_names)}, Nationalities: {len(nationalities)}, DataFrame: {len(df)}")
-            return None
+            manifest.mark_done(key, league_data, league_data.attrs.get('fingerprints'))
+
+        stage.update(rows=len(league_data), columns=len(league_data.columns))
+        for sink in sinks:
+            sink.append(league_data)
 
-        # REMOVE THE LAST COLUMN
-        if len(df.columns) > 0:
-            df = df.iloc[:, :-1]  # Remove the last column
-            print(f"Removed last column. DataFrame now has {len(df.columns)} columns")
+    return manifest.leagues[key].get('refresh') != 'failed'
 
-        return df
 
+def record_league(entry, started, succeeded):
+    """Close the current league in the run metrics with its total time and outcome"""
+    if METRICS is not None:
+        METRICS.emit('league', name=entry['league'], tier=entry['tier'],
+                     status='done' if succeeded else 'failed',
+                     seconds=round(time.perf_counter() - started, 6))
+
+
+def checkpointed_league_job(pool, manifest, sinks, key, position, total_leagues, page_timeout, fetch_mode,
+                            categories=DEFAULT_CATEGORIES):
+    """Scrape one league and checkpoint the outcome in the run manifest straight away"""
+    entry = manifest.leagues[key]
+    CURRENT_LEAGUE.set(key)
+    started = time.perf_counter()
+
+    try:
+        league_data = scrape_league_job(pool, entry['tier'], entry['league'], entry['url'],
+                                        position, total_leagues, page_timeout, fetch_mode,
+                                        manifest.stored_fingerprints(key), categories, entry.get('season'))
     except Exception as e:
-        print(f"Error scraping {league_name}: {str(e)}")
+        print(f"❌ Failed to scrape {entry['league']}: {str(e)}")
+        succeeded = checkpoint_league(manifest, sinks, key, None, str(e))
+    else:
+        succeeded = checkpoint_league(manifest, sinks, key, league_data)
+
+    record_league(entry, started, succeeded)
+    return succeeded
+
+
+def scrape_leagues_threaded(manifest, sinks, jobs, workers, args):
+    """Scrape the given manifest keys on a thread pool, one blocking fetch per worker"""
+    pool = DriverPool(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(checkpointed_league_job, pool, manifest, sinks, key, position, len(jobs),
+                                args.page_timeout, args.fetch, args.categories)
+                for position, key in enumerate(jobs, 1)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        pool.close()
+
+
+def retry_after_seconds(value, limit=MAX_RETRY_AFTER):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), at most `limit`, or None"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
         try:
-            driver.quit()
-        except:
-            pass
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError, OverflowError):
+            return None
+    if seconds != seconds:  # NaN
         return None
+    return min(max(0.0, seconds), limit)
 
 
-def main():
+async def fetch_page_async(session, semaphore, url, timeout=DEFAULT_PAGE_TIMEOUT, retries=HTTP_RETRIES):
     """
-    Main function to discover and scrape domestic football leagues from specific tier sections
+    Async counterpart of fetch_page_http: same page cache and per-host budget, with
+    at most `semaphore` requests in flight. 429/5xx and truncated bodies are retried
+    with exponential backoff, or after the server's Retry-After when it sends one.
     """
-    print("🏆 FBREF DOMESTIC LEAGUES SCRAPER (TIER-SPECIFIC)")
-    print("=" * 60)
+    entry = PAGE_CACHE.lookup(url) if PAGE_CACHE else None
+    if entry is not None and PAGE_CACHE.is_fresh(entry):
+        with timed_stage('fetch', url=url, cache='hit') as stage:
+            body = PAGE_CACHE.read_body(entry)
+            stage['bytes'] = len(body.encode('utf-8'))
+        return body
+
+    headers = PageCache.validators(entry) if entry is not None else {}
+
+    for attempt in range(retries + 1):
+        with timed_stage('rate_limit_wait', url=url):
+            await RATE_LIMITER.wait_async(url)
+
+        with timed_stage('fetch', url=url, attempt=attempt) as stage:
+            async with semaphore:
+                async with session.get(url, headers=headers,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    stage['status'] = response.status
+                    if response.status == 304 and entry is not None:
+                        PAGE_CACHE.touch(url, entry, response.headers)
+                        body = PAGE_CACHE.read_body(entry)
+                        stage.update(cache='revalidated', bytes=len(body.encode('utf-8')))
+                        return body
+
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        delay = retry_after_seconds(response.headers.get('Retry-After'))
+                        if delay is None:
+                            delay = backoff_delay(attempt)
+                        print(f"   HTTP {response.status} for {url}, retrying in {delay:.0f}s")
+                    elif is_missing_status(response.status):
+                        raise MissingPage(f"HTTP {response.status} for {url}")
+                    else:
+                        response.raise_for_status()
+                        try:
+                            content = await response.read()
+                        except aiohttp.ClientPayloadError as e:
+                            if attempt == retries:
+                                raise
+                            stage['truncated'] = True
+                            delay = backoff_delay(attempt)
+                            print(f"   Truncated response for {url} ({e}), retrying in {delay:.0f}s")
+                        else:
+                            body = content.decode(response.get_encoding())
+                            stage.update(cache='miss', bytes=len(content))
+                            if PAGE_CACHE:
+                                PAGE_CACHE.store(url, body, response.headers)
+                            return body
+
+        with timed_stage('retry_wait', url=url, attempt=attempt):
+            await asyncio.sleep(delay)
+
+
+async def scrape_league_async(session, semaphore, parse_pool, io_pool, driver_pool, manifest, sinks, key,
+                              position, total_leagues, page_timeout, fetch_mode, categories=DEFAULT_CATEGORIES):
+    """
+    Scrape and checkpoint one league on the event loop. Fetching is async, parsing
+    runs on the process pool and the Selenium fallback and shard writes on threads,
+    so the loop itself never blocks. The league's category pages are fetched
+    concurrently, under the same rate limiter and in-flight semaphore as every
+    other page.
+    """
+    loop = asyncio.get_running_loop()
+    entry = manifest.leagues[key]
+    league_name, league_url = entry['league'], entry['url']
+    stored_fingerprints = manifest.stored_fingerprints(key)
+    CURRENT_LEAGUE.set(key)
+    started = time.perf_counter()
+
+    def in_thread(func, *args):
+        # Run on the I/O threads with this task's context, so metrics stay tagged with the league
+        return loop.run_in_executor(io_pool, contextvars.copy_context().run, func, *args)
+
+    async def scrape_category(category, stored_fingerprint=None):
+        page_url = category_url(league_url, category)
+        league_data = None
+        if fetch_mode == 'http':
+            try:
+                page_source = await fetch_page_async(session, semaphore, page_url, page_timeout)
+                # RECORD_FINGERPRINTS is passed along, as worker processes don't see main()'s setting
+                league_data, timings = await loop.run_in_executor(parse_pool, parse_league_page_timed,
+                                                                  page_source, league_name, stored_fingerprint,
+                                                                  category, RECORD_FINGERPRINTS)
+                record_parse_timings(timings, page_source, league_data)
+            except MissingPage as e:
+                print(f"   No {category} stats page for {league_name} ({e})")
+                return None
+            except Exception as e:
+                print(f"HTTP scrape failed for {league_name} ({category}): {str(e)}")
+            if league_data is None:
+                print(f"   Falling back to Selenium for {league_name} ({category})")
+
+        if league_data is None:
+            try:
+                league_data = await in_thread(scrape_league_selenium_fallback, driver_pool,
+                                              page_url, league_name, page_timeout, stored_fingerprint, category)
+            except Exception as e:
+                # Only the standard stats are essential; the league goes on without this category
+                if category == 'standard':
+                    raise
+                print(f"❌ Failed to scrape {league_name} ({category}): {str(e)}")
+        return league_data
+
+    label = league_name if entry.get('season') is None else f"{league_name} {entry['season']}"
+    print(f"\n[{position}/{total_leagues}] Processing {label} ({entry['tier']})...")
 
-    # Step 1: Discover domestic leagues by tier from specific sections
-    leagues_by_tier = discover_domestic_leagues_by_tier()
+    try:
+        results = dict(zip(categories, await asyncio.gather(*[
+            scrape_category(category, stored_fingerprints.get(category)) for category in categories
+        ])))
 
-    total_leagues = sum(len(leagues_by_tier[tier]) for tier in leagues_by_tier)
-    if total_leagues == 0:
-        print("❌ No domestic leagues discovered. Exiting.")
-        return
+        if league_unchanged(results, stored_fingerprints):
+            league_data = UnchangedLeague(stored_fingerprints.get('standard'))
+        else:
+            # Some table changed, so the unchanged ones are needed in full for the join;
+            # they are extracted from the pages already fetched
+            for category, result in results.items():
+                if isinstance(result, UnchangedLeague):
+                    results[category], timings = await loop.run_in_executor(
+                        parse_pool, parse_league_page_timed, result.page_source, league_name, None, category,
+                        RECORD_FINGERPRINTS)
+                    record_parse_timings(timings, result.page_source, results[category])
+            league_data = combine_categories(results, stored_fingerprints)
+
+        league_data = finish_league(league_data, entry['tier'], league_name, entry.get('season'))
+        succeeded = await in_thread(checkpoint_league, manifest, sinks, key, league_data)
 
-    # Print detailed breakdown
-    print("\n📊 Discovered leagues by tier:")
-    for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
-        count = len(leagues_by_tier[tier])
-        print(f"\n{tier}: {count} leagues")
-        if count > 0:
-            for i, league_name in enumerate(sorted(leagues_by_tier[tier].keys()), 1):
-                print(f"  {i:2d}. {league_name}")
-
-    # Step 2: Scrape all discovered leagues
-    all_leagues_data = []
-    successful_scrapes = 0
-    failed_scrapes = []
-
-    print(f"\n🚀 Starting to scrape {total_leagues} domestic football leagues...")
-    print("=" * 60)
+    except Exception as e:
+        print(f"❌ Failed to scrape {league_name}: {str(e)}")
+        succeeded = await in_thread(checkpoint_league, manifest, sinks, key, None, str(e))
 
-    league_counter = 1
-    for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
-        tier_leagues = leagues_by_tier[tier]
+    record_league(entry, started, succeeded)
+    return succeeded
 
-        if len(tier_leagues) > 0:
-            print(f"\n🏆 Processing {tier} leagues ({len(tier_leagues)} leagues)...")
 
-            for league_name, league_url in tier_leagues.items():
-                print(f"\n[{league_counter}/{total_leagues}] Processing {league_name} ({tier})...")
+async def scrape_leagues_async(manifest, sinks, jobs, workers, args):
+    """
+    Event-driven engine: every pending league is scheduled at once and the shared
+    per-domain budgets and the in-flight semaphore decide how fast they proceed.
+    """
+    if aiohttp is None:
+        raise SystemExit("The async engine needs aiohttp: pip install aiohttp")
 
-                # Scrape league data
-                league_data = scrape_fbref_players_selenium(league_url, league_name)
+    semaphore = asyncio.Semaphore(args.max_in_flight)
+    driver_pool = DriverPool(workers)
+    connector = aiohttp.TCPConnector(limit=args.max_in_flight)
 
-                if league_data is not None:
-                    # Clean up column names if they're MultiIndex
-                    if isinstance(league_data.columns, pd.MultiIndex):
-                        league_data.columns = [' '.join(col).strip() for col in league_data.columns.values]
+    try:
+        with ProcessPoolExecutor(max_workers=args.parse_workers) as parse_pool, \
+                ThreadPoolExecutor(max_workers=workers) as io_pool:
+            async with aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS) as session:
+                await asyncio.gather(*[
+                    scrape_league_async(session, semaphore, parse_pool, io_pool, driver_pool, manifest, sinks, key,
+                                        position, len(jobs), args.page_timeout, args.fetch, args.categories)
+                    for position, key in enumerate(jobs, 1)
+                ])
+    finally:
+        driver_pool.close()
+
+
+def record_run_history(runs_dir, summary):
+    """Append a run's headline numbers to <runs dir>/history.jsonl, to track throughput across runs"""
+    os.makedirs(runs_dir, exist_ok=True)
+    with open(os.path.join(runs_dir, 'history.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({k: v for k, v in summary.items() if k not in ['stages', 'slowest_leagues']},
+                           ensure_ascii=False) + '\n')
+
+
+def print_metrics_summary(summary):
+    """Print where the time of a run went: per stage (summed over workers) and the slowest leagues"""
+    if summary['stages']:
+        print(f"\n⏱️  Time per stage (summed over all workers):")
+        print(f"  {'stage':16s} {'count':>6s} {'total s':>9s} {'mean s':>8s} {'p95 s':>8s} {'max s':>8s}")
+        for stage, stats in summary['stages'].items():
+            print(f"  {stage:16s} {stats['count']:6d} {stats['total_seconds']:9.2f} {stats['mean_seconds']:8.3f} "
+                  f"{stats['p95_seconds']:8.3f} {stats['max_seconds']:8.3f}")
+
+    if summary['slowest_leagues']:
+        print(f"\n🐢 Slowest leagues:")
+        for league in summary['slowest_leagues']:
+            print(f"  {league['league']} ({league['tier']}): {league['seconds']:.1f}s, "
+                  f"{league['bytes'] / 1024:,.0f} KiB, {league['rows'] or 0} rows, "
+                  f"mostly {league['slowest_stage']} [{league['status']}]")
+
+
+def parse_domain_budget(value):
+    """argparse type for DOMAIN=REQUESTS_PER_MINUTE"""
+    domain, sep, budget = value.partition('=')
+    try:
+        if not sep or not domain:
+            raise ValueError
+        return domain.strip().lower(), float(budget)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected DOMAIN=REQUESTS_PER_MINUTE, got {value!r}")
 
-                    # Remove unnamed columns
-                    league_data = league_data.loc[:, ~league_data.columns.str.contains('^Unnamed')]
 
-                    # Add tier information
-                    league_data.insert(1, 'Tier', tier)
+def parse_categories(value):
+    """argparse type for a comma-separated list of stats categories, or 'all'"""
+    if value.strip().lower() == 'all':
+        names = list(STAT_CATEGORIES)
+    else:
+        names = [name.strip().lower() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STAT_CATEGORIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stats categories {', '.join(unknown)}; "
+                                         f"choose from {', '.join(STAT_CATEGORIES)} or 'all'")
+    # Every other category is joined onto the standard stats, so they are always scraped
+    return ['standard'] + [name for name in dict.fromkeys(names) if name != 'standard']
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Scrape FBRef domestic league player stats by tier")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"number of leagues scraped at once, one Chrome driver each (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--requests-per-minute", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f"request budget per host, shared by all workers (default: {DEFAULT_REQUESTS_PER_MINUTE})")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST,
+                        help=f"requests allowed back-to-back before the budget applies (default: {DEFAULT_BURST})")
+    parser.add_argument("--domain-budget", type=parse_domain_budget, action="append", default=[],
+                        metavar="DOMAIN=RPM",
+                        help="request budget for one domain and its subdomains, overriding "
+                             "--requests-per-minute (repeatable)")
+    parser.add_argument("--engine", choices=['threads', 'async'], default='threads',
+                        help="'threads' runs one blocking fetch per worker; 'async' keeps many fetches "
+                             "in flight on an event loop and parses on a process pool (default: threads)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"async engine: most HTTP requests open at once (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="async engine: processes parsing pages (default: one per CPU)")
+    parser.add_argument("--page-timeout", type=float, default=DEFAULT_PAGE_TIMEOUT,
+                        help=f"seconds to wait for a page's stats table (default: {DEFAULT_PAGE_TIMEOUT})")
+    parser.add_argument("--fetch", choices=FETCH_MODES, default='http',
+                        help="'http' reads the server HTML and falls back to Selenium when that fails; "
+                             "'selenium' always renders pages in Chrome (default: http)")
+    parser.add_argument("--lean-driver", action="store_true",
+                        help="Chrome downloads only documents: stylesheets, fonts, scripts, media and ad/analytics "
+                             "hosts are blocked, and each pooled driver keeps a warm profile in --profile-dir")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR,
+                        help=f"lean drivers: directory of the persistent Chrome profiles (default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL,
+                        help="site to scrape, e.g. a local stand-in server for load tests "
+                             f"(default: {DEFAULT_BASE_URL})")
+    parser.add_argument("--categories", type=parse_categories, default=None,
+                        help=f"stats categories joined into each player row, comma-separated "
+                             f"({', '.join(STAT_CATEGORIES)}) or 'all'; each one is another page per "
+                             f"league (default: standard, or the categories of the run resumed)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"directory of the on-disk page cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL,
+                        help="seconds a cached page is used without revalidating it with FBRef "
+                             f"(default: {DEFAULT_CACHE_TTL})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always download pages and don't write the cache")
+    parser.add_argument("--parquet", action="store_true",
+                        help=f"also write the dataset as Parquet partitioned by Tier/League to {PARQUET_DIRNAME}/")
+    parser.add_argument("--runs-dir", default=DEFAULT_RUNS_DIR,
+                        help=f"directory holding one checkpoint folder per run (default: {DEFAULT_RUNS_DIR})")
+    parser.add_argument("--run-dir",
+                        help="checkpoint folder of this run (default: a new timestamped folder in --runs-dir)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the run in --run-dir (or the latest run): completed leagues are "
+                             "skipped and failed or pending ones are scraped again")
+    parser.add_argument("--backfill", action="store_true",
+                        help="scrape the completed past seasons of every league into the season archive "
+                             "(--archive-dir); seasons already archived are never fetched again")
+    parser.add_argument("--seasons", type=int, default=DEFAULT_BACKFILL_SEASONS,
+                        help="backfill: most recent completed seasons per league, 0 for all "
+                             f"(default: {DEFAULT_BACKFILL_SEASONS})")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR,
+                        help=f"backfill: season-partitioned archive of completed seasons (default: {DEFAULT_ARCHIVE_DIR})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-check every league of --run-dir (or the latest run): leagues whose stats "
+                             "table is unchanged are skipped and changed ones only upsert their new and "
+                             "changed player rows into the stored shards")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="fingerprint every stats table into the run's manifest, so the first --refresh of "
+                             "the run can already skip unchanged leagues (refreshes always fingerprint)")
+    args = parser.parse_args(argv)
+    if args.backfill and (args.resume or args.refresh):
+        parser.error("--backfill can't be combined with --resume or --refresh; "
+                     "run --backfill again to fetch the seasons a backfill missed")
+    return args
+
+
+def main(argv=None):
+    """
+    Main function to discover and scrape domestic football leagues from specific tier sections
+    """
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    RATE_LIMITER.configure(args.requests_per_minute, args.burst, dict(args.domain_budget))
+    get_http_session(pool_size=workers)
 
-                    # Add to combined dataset
-                    all_leagues_data.append(league_data)
-                    successful_scrapes += 1
+    global LEAN_DRIVER, DRIVER_PROFILE_DIR, RECORD_FINGERPRINTS
+    LEAN_DRIVER = args.lean_driver
+    RECORD_FINGERPRINTS = args.refresh or args.fingerprint
+    DRIVER_PROFILE_DIR = args.profile_dir if args.lean_driver else None
 
-                    print(f"✅ Successfully scraped {len(league_data)} players from {league_name}")
-                    print(f"   DataFrame has {len(league_data.columns)} columns")
-                else:
-                    failed_scrapes.append(f"{league_name} ({tier})")
-                    print(f"❌ Failed to scrape {league_name}")
+    # A refresh has to ask FBRef about every page, so cached copies are always revalidated
+    global PAGE_CACHE
+    PAGE_CACHE = None if args.no_cache else PageCache(args.cache_dir, 0 if args.refresh else args.cache_ttl)
 
-                league_counter += 1
+    print("🏆 FBREF DOMESTIC LEAGUES SCRAPER (TIER-SPECIFIC)")
+    print("=" * 60)
 
-                # Add delay between requests to be respectful
-                if league_counter <= total_leagues:
-                    print("   Waiting 3 seconds before next request...")
-                    time.sleep(3)
+    archive = SeasonArchive(args.archive_dir) if args.backfill else None
+    discover_seconds = None
+    if args.resume or args.refresh:
+        run_dir = args.run_dir or latest_run_dir(args.runs_dir)
+        if run_dir is None or not os.path.exists(os.path.join(run_dir, RunManifest.FILENAME)):
+            print(f"❌ No run to {'refresh' if args.refresh else 'resume'}. Exiting.")
+            return
+
+        # Reuse the league list recorded when the run started instead of rediscovering it
+        manifest = RunManifest.load(run_dir)
+        if manifest.data.get('mode') == 'backfill':
+            print(f"❌ {run_dir} is a backfill; run --backfill again to fetch the seasons it missed. Exiting.")
+            return
+        if args.refresh:
+            print(f"🔄 Refreshing run {manifest.data['run_id']} from {run_dir}")
+            manifest.begin_refresh()
+        else:
+            print(f"♻️  Resuming run {manifest.data['run_id']} from {run_dir}")
+        print(f"   Completed: {len(manifest.with_status('done'))}, "
+              f"failed: {len(manifest.with_status('failed'))}, "
+              f"pending: {len(manifest.with_status('pending'))}")
+    else:
+        # Step 1: Discover domestic leagues by tier from specific sections
+        discover_started = time.perf_counter()
+        leagues_by_tier = discover_domestic_leagues_by_tier(args.page_timeout, args.fetch, args.base_url)
 
-    # Step 3: Save results
-    if all_leagues_data:
-        combined_df = pd.concat(all_leagues_data, ignore_index=True)
+        total_leagues = sum(len(leagues_by_tier[tier]) for tier in leagues_by_tier)
+        if total_leagues == 0:
+            print("❌ No domestic leagues discovered. Exiting.")
+            return
 
-        # Generate timestamp for filename
+        # Print detailed breakdown
+        print("\n📊 Discovered leagues by tier:")
+        for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
+            count = len(leagues_by_tier[tier])
+            print(f"\n{tier}: {count} leagues")
+            if count > 0:
+                for i, league_name in enumerate(sorted(leagues_by_tier[tier].keys()), 1):
+                    print(f"  {i:2d}. {league_name}")
+
+        # A backfill schedules every completed season the archive doesn't have yet
+        seasons = None
+        if args.backfill:
+            seasons = discover_past_seasons(leagues_by_tier, archive, args.seasons, workers,
+                                            args.page_timeout, args.fetch, args.base_url)
+            if not any(seasons.values()):
+                print(f"\n✅ Every completed season is already in {args.archive_dir}. Exiting.")
+                return
+        discover_seconds = time.perf_counter() - discover_started
+
+        # Generate timestamp for the run folder; backfills get their own folder so
+        # --resume/--refresh keep finding the latest regular run
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        combined_filename = f"Football_Players_Data.csv"
+        run_dir = args.run_dir or os.path.join(args.runs_dir, *(['backfill'] if args.backfill else []), timestamp)
+        manifest = RunManifest.create(run_dir, leagues_by_tier, args.categories or DEFAULT_CATEGORIES, seasons)
+        print(f"\n💾 Checkpointing this run to {run_dir}")
+
+    # A resumed or refreshed run keeps the categories it was started with unless told otherwise
+    if args.categories and args.categories != manifest.categories:
+        manifest.data['categories'] = args.categories
+        manifest.save()
+    args.categories = manifest.categories
+    if args.categories != DEFAULT_CATEGORIES:
+        print(f"📚 Stats categories: {', '.join(args.categories)}")
+
+    total_leagues = len(manifest.leagues)
+
+    # Step 2: Scrape every league that hasn't been completed yet, or every league when refreshing
+    if args.refresh:
+        jobs = list(manifest.leagues)
+    else:
+        jobs = [key for key, _ in manifest.with_status('pending', 'failed')]
+
+    # Timings and sizes of every stage go to <run dir>/metrics.jsonl
+    global METRICS
+    METRICS = RunMetrics(run_dir)
+    METRICS.emit('run_started', engine=args.engine, fetch=args.fetch, lean_driver=args.lean_driver,
+                 workers=workers, resume=args.resume, refresh=args.refresh, backfill=args.backfill, categories=args.categories,
+                 leagues=total_leagues, jobs=len(jobs))
+    if discover_seconds is not None:
+        METRICS.stage('discover', discover_seconds, leagues=total_leagues)
+
+    units = "past league-seasons" if args.backfill else "domestic football leagues"
+    if args.engine == 'async':
+        print(f"\n🚀 Starting to scrape {len(jobs)} of {total_leagues} {units} "
+              f"(async, up to {args.max_in_flight} requests in flight)...")
+    else:
+        print(f"\n🚀 Starting to scrape {len(jobs)} of {total_leagues} {units} with {workers} workers...")
+    print("=" * 60)
 
-        # Save with proper UTF-8 encoding to preserve special characters
-        combined_df.to_csv(combined_filename, index=False, encoding='utf-8-sig')
+    # The combined dataset is streamed to disk: leagues finished in an earlier
+    # attempt first, then each new league as soon as it is done (when refreshing,
+    # every league is streamed by its job, stored rows included). A backfill keeps
+    # its combined files in its run folder, next to the current season's dataset,
+    # and files every league-season into the season archive
+    output_dir = run_dir if args.backfill else ''
+    combined_filename = os.path.join(output_dir, COMBINED_FILENAME)
+    writer = DatasetWriter(combined_filename)
+    sinks = [writer]
+    if args.parquet:
+        sinks.append(ParquetDatasetWriter(os.path.join(output_dir, PARQUET_DIRNAME)))
+    if archive is not None:
+        sinks.append(archive)
+
+    scrape_started = time.monotonic()
+    try:
+        for key, _ in [] if args.refresh else manifest.with_status('done'):
+            league_data = manifest.read_shard(key)
+            for sink in sinks:
+                sink.append(league_data)
 
+        if args.engine == 'async':
+            asyncio.run(scrape_leagues_async(manifest, sinks, jobs, workers, args))
+        else:
+            scrape_leagues_threaded(manifest, sinks, jobs, workers, args)
+    finally:
+        for sink in sinks:
+            sink.close()
+        metrics_summary = METRICS.close()
+        METRICS = None
+    scrape_seconds = time.monotonic() - scrape_started
+    record_run_history(args.runs_dir, metrics_summary)
+
+    successful_scrapes = len(manifest.with_status('done'))
+    failed_scrapes = [f"{entry['league']} ({entry['tier']})" for _, entry in manifest.with_status('failed')]
+
+    # Step 3: Summarise the combined dataset from the writer's running counts
+    if successful_scrapes:
         print("\n" + "=" * 60)
         print("🎉 SCRAPING SUMMARY")
         print("=" * 60)
         print(f"✅ Successful scrapes: {successful_scrapes}/{total_leagues}")
-        print(f"📊 Total players scraped: {len(combined_df):,}")
-        print(f"📋 Total columns in dataset: {len(combined_df.columns)}")
+        if jobs and scrape_seconds:
+            print(f"⏱️  Scraped {len(jobs)} leagues in {scrape_seconds:.1f}s "
+                  f"({len(jobs) / scrape_seconds * 60:.1f} leagues/min)")
+        if args.refresh:
+            refreshed = [entry for entry in manifest.leagues.values() if entry.get('refresh')]
+            updated = [entry for entry in refreshed if entry['refresh'] == 'updated']
+            print(f"🔄 Refresh: {sum(entry['refresh'] == 'unchanged' for entry in refreshed)} leagues unchanged, "
+                  f"{len(updated)} updated ({sum(entry['added'] for entry in updated)} rows added, "
+                  f"{sum(entry['changed'] for entry in updated)} changed), "
+                  f"{sum(entry['refresh'] == 'failed' for entry in refreshed)} failed (stored rows kept)")
+        print(f"📊 Total players scraped: {writer.rows:,}")
+        print(f"📋 Total columns in dataset: {len(writer.columns)}")
         print(f"💾 Combined dataset saved to: {combined_filename}")
+        if args.parquet:
+            print(f"💾 Partitioned Parquet dataset saved to: {os.path.join(output_dir, PARQUET_DIRNAME)}/")
+        if archive is not None:
+            print(f"🗄️  {archive.written} league-seasons added to the season archive in {archive.root}/")
 
         if failed_scrapes:
             print(f"❌ Failed leagues ({len(failed_scrapes)}): {', '.join(failed_scrapes[:10])}")
@@ -440,39 +2242,37 @@ def main():
 
         # Display sample of combined data
         print(f"\n📋 Sample of combined dataset:")
-        sample_cols = ['League', 'Tier', 'Player', 'Team', 'Nationality']
-        available_cols = [col for col in sample_cols if col in combined_df.columns]
-        print(combined_df[available_cols].head(15).to_string(index=False))
+        print(pd.DataFrame(writer.sample).to_string(index=False))
 
         # Show all column names
         print(f"\n📝 All columns in the dataset:")
-        for i, col in enumerate(combined_df.columns, 1):
+        for i, col in enumerate(writer.columns, 1):
             print(f"  {i:2d}. {col}")
 
         # Tier distribution
         print(f"\n🏆 Players per tier:")
-        if 'Tier' in combined_df.columns:
-            tier_counts = combined_df['Tier'].value_counts()
-            for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
-                if tier in tier_counts:
-                    print(f"  {tier}: {tier_counts[tier]:,} players")
+        for tier in ['Tier 1', 'Tier 2', 'Tier 3']:
+            if tier in writer.tier_counts:
+                print(f"  {tier}: {writer.tier_counts[tier]:,} players")
 
         # League distribution (top 15)
         print(f"\n🏟️  Top leagues by player count:")
-        league_counts = combined_df['League'].value_counts().head(15)
-        for league, count in league_counts.items():
+        for league, count in writer.league_counts.most_common(15):
             print(f"  {league}: {count} players")
 
         # Country distribution (top 10)
-        if 'Nationality' in combined_df.columns:
+        if writer.nationality_counts:
             print(f"\n🌍 Top nationalities:")
-            nationality_counts = combined_df['Nationality'].value_counts().head(10)
-            for nationality, count in nationality_counts.items():
+            for nationality, count in writer.nationality_counts.most_common(10):
                 print(f"  {nationality}: {count} players")
 
     else:
         print("\n❌ No data was successfully scraped from any league.")
 
+    print_metrics_summary(metrics_summary)
+    print(f"\n📈 Per-stage metrics saved to {os.path.join(run_dir, RunMetrics.FILENAME)} "
+          f"(summary: {RunMetrics.SUMMARY_FILENAME})")
+
 
 if __name__ == "__main__":
     main()
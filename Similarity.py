@@ -0,0 +1,252 @@
+"""
+"Who plays like X?" - similarity search over the scraped player dataset.
+
+Every player row with some playing time becomes a vector of its per-90 stats
+(`Per 90 Minutes *`) and expected stats (`Expected *`, turned into per-90 rates),
+standardized per stat and scaled to unit length, so the dot product of two
+vectors is their cosine similarity. The vectors are built once and saved next to
+the dataset (Football_Players_Data.similarity.npz); queries load them and rank
+every candidate with one matrix product, rebuilding only when the dataset changes.
+
+    python Similarity.py "Bukayo Saka" -k 10
+    python Similarity.py "Bukayo Saka" --team Arsenal --tier "Tier 1" --min-90s 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from Query import PlayerQueries, default_data_path, source_signature
+
+# Stats that make up a player's vector, by column prefix
+FEATURE_PREFIXES = ('Per 90 Minutes ', 'Expected ')
+# Expected stats are season totals; they are divided by this to get per-90 rates
+MINUTES_COLUMN = 'Playing Time 90s'
+# Rows with less playing time than this are too noisy to index
+INDEX_MIN_90S = 1.0
+
+# Per-row details kept in the index, shown with every result
+META_COLUMNS = ['Player', 'Player ID', 'Team', 'League', 'Tier', MINUTES_COLUMN]
+
+# Bumped when the saved layout or contents change, so older index files are rebuilt
+INDEX_VERSION = 2
+
+
+def default_index_path(data_path):
+    """Football_Players_Data.parquet -> Football_Players_Data.similarity.npz"""
+    return os.path.splitext(data_path.rstrip('/\\'))[0] + '.similarity.npz'
+
+
+def feature_columns(columns):
+    return [col for col in columns if col.startswith(FEATURE_PREFIXES)]
+
+
+class SimilarityIndex:
+    """
+    Unit-length, standardized per-90 vectors of every indexed player row, with the
+    rows' details and the statistics used to standardize them. Build it with
+    SimilarityIndex.build(), persist it with save() and get it back with load(), or
+    let SimilarityIndex.open() do whichever is needed.
+    """
+
+    def __init__(self, vectors, meta, features, means, stds, signature=None, version=INDEX_VERSION):
+        self.vectors = vectors
+        self.meta = meta
+        self.features = features
+        self.means = means
+        self.stds = stds
+        self.signature = signature
+        self.version = version
+        self._players = None
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @classmethod
+    def build(cls, data_path, min_90s=INDEX_MIN_90S):
+        """Vectors for every player row of the dataset with at least `min_90s` played"""
+        with PlayerQueries(data_path) as queries:
+            features = feature_columns(queries.columns)
+            if not features:
+                raise SystemExit(f"{data_path} has no '{FEATURE_PREFIXES[0]}*' or '{FEATURE_PREFIXES[1]}*' columns")
+            meta_columns = [col for col in META_COLUMNS if col in queries.columns]
+            selected = ', '.join(queries.column(col) for col in dict.fromkeys(meta_columns + features))
+            df = queries.sql(f"SELECT {selected} FROM players WHERE {queries.column(MINUTES_COLUMN)} >= ?", [min_90s])
+
+        values = df[features].to_numpy(dtype='float64', copy=True)
+        totals = [i for i, col in enumerate(features) if col.startswith('Expected ')]
+        values[:, totals] /= df[MINUTES_COLUMN].to_numpy(dtype='float64')[:, None]
+
+        # Standardize each stat, count a missing stat as average, and scale every
+        # row to unit length so that a dot product is the cosine similarity
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0)
+        stds[~(stds > 0)] = 1.0
+        vectors = np.nan_to_num((values - means) / stds)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.where(norms > 0, norms, 1.0)).astype('float32')
+
+        # Missing text (e.g. a player without an FBRef ID) is stored as ''
+        meta = {col: df[col].to_numpy(dtype='float64') if col == MINUTES_COLUMN
+                else df[col].astype('string').fillna('').to_numpy(dtype='U')
+                for col in meta_columns}
+        return cls(vectors, meta, features, means, stds, source_signature(data_path))
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp.npz"
+        meta = {f"meta_{i}": values for i, values in enumerate(self.meta.values())}
+        np.savez(tmp_path, vectors=self.vectors, features=np.array(self.features), means=self.means,
+                 stds=self.stds, signature=np.array(self.signature or ''), meta_columns=np.array(list(self.meta)),
+                 version=np.array(self.version), **meta)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = {col: data[f"meta_{i}"] for i, col in enumerate(data['meta_columns'].tolist())}
+            return cls(data['vectors'], meta, data['features'].tolist(), data['means'], data['stds'],
+                       str(data['signature']) or None, int(data['version']) if 'version' in data.files else 1)
+
+    @classmethod
+    def open(cls, data_path=None, index_path=None, rebuild=False):
+        """The saved index of the dataset, rebuilt and saved again when the dataset changed"""
+        data_path = data_path or default_data_path()
+        index_path = index_path or default_index_path(data_path)
+
+        signature = source_signature(data_path)
+        if not rebuild and os.path.exists(index_path):
+            index = cls.load(index_path)
+            if index.version == INDEX_VERSION and (signature is None or index.signature == signature):
+                return index
+
+        start = time.perf_counter()
+        index = cls.build(data_path)
+        index.save(index_path)
+        print(f"🧭 Indexed {len(index):,} player rows x {len(index.features)} stats into {index_path} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return index
+
+    def find(self, player, team=None):
+        """
+        Row of a player, by FBRef player ID or (case-insensitive) name. A player with
+        rows at several clubs gets the one at `team`, or else the one with the most
+        playing time. Raises KeyError when nothing matches.
+        """
+        matches = (self.meta['Player ID'] == player if 'Player ID' in self.meta and player
+                   else np.zeros(len(self), bool))
+        if not matches.any():
+            matches = np.char.lower(self.meta['Player']) == player.lower()
+        if team is not None and 'Team' in self.meta:
+            matches &= np.char.lower(self.meta['Team']) == team.lower()
+        rows = np.flatnonzero(matches)
+        if not len(rows):
+            raise KeyError(f"No indexed player {player!r}" + (f" at {team!r}" if team else ""))
+        return rows[np.argmax(self.meta[MINUTES_COLUMN][rows])]
+
+    def players(self):
+        """A number per row identifying its player; rows without a player ID count as players of their own"""
+        if self._players is None:
+            ids = self.meta['Player ID']
+            _, self._players = np.unique(np.where(ids == '', np.char.add('#', np.arange(len(self)).astype('U')), ids),
+                                         return_inverse=True)
+        return self._players
+
+    def candidates(self, tiers=None, leagues=None, min_90s=None):
+        """Boolean mask of the rows passing the filters"""
+        mask = np.ones(len(self), dtype=bool)
+        for col, values in [('Tier', tiers), ('League', leagues)]:
+            if values is not None:
+                mask &= np.isin(self.meta[col], list(values))
+        if min_90s is not None:
+            mask &= self.meta[MINUTES_COLUMN] >= min_90s
+        return mask
+
+    def nearest(self, rows, k=10, **filters):
+        """
+        The `k` most similar candidate players for each of `rows`, as (row indices,
+        similarities) arrays of shape (len(rows), <=k), best first. All queries are
+        scored in one matrix product; a player with rows at several clubs is
+        represented by their best-scoring row, and a query player's own rows are
+        never returned. Rows without a player ID count as players of their own.
+        """
+        rows = np.asarray(rows)
+        candidates = np.flatnonzero(self.candidates(**filters))
+        scores = self.vectors[rows] @ self.vectors[candidates].T
+        scores[rows[:, None] == candidates[None, :]] = -np.inf
+
+        if 'Player ID' in self.meta and len(candidates):
+            ids = self.meta['Player ID']
+            query_ids = ids[rows][:, None]
+            scores[(query_ids == ids[candidates][None, :]) & (query_ids != '')] = -np.inf
+
+            # Best row of each player: group the candidates by player, take each
+            # group's highest score and the first of its rows that scored it
+            groups = self.players()[candidates]
+            order = np.argsort(groups, kind='stable')
+            starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+            sizes = np.diff(np.r_[starts, len(order)])
+            grouped = scores[:, order]
+            scores = np.maximum.reduceat(grouped, starts, axis=1)
+            positions = np.where(grouped == np.repeat(scores, sizes, axis=1), np.arange(len(order)), len(order))
+            players = candidates[order][np.minimum.reduceat(positions, starts, axis=1)]
+        else:
+            players = np.broadcast_to(candidates, scores.shape)
+
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return np.empty((len(rows), 0), dtype=int), np.empty((len(rows), 0), dtype='float32')
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return np.take_along_axis(players, top, axis=1), np.take_along_axis(scores, top, axis=1)
+
+    def similar_players(self, player, k=10, team=None, **filters):
+        """DataFrame of the `k` players most like `player`, with their similarity (1 = identical profile)"""
+        row = self.find(player, team)
+        indices, scores = self.nearest([row], k, **filters)
+        keep = np.isfinite(scores[0])
+        result = pd.DataFrame({col: values[indices[0][keep]] for col, values in self.meta.items()})
+        result['Similarity'] = scores[0][keep].round(3)
+        return result
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Find the players whose per-90 profile is most like a player's")
+    parser.add_argument("player", help="player name or FBRef player ID")
+    parser.add_argument("-k", type=int, default=10, help="players to list (default: 10)")
+    parser.add_argument("--team", default=None, help="the player's team, for players with rows at several clubs")
+    parser.add_argument("--tier", action="append", dest="tiers", help="only candidates from this tier (repeatable)")
+    parser.add_argument("--league", action="append", dest="leagues", help="only candidates from this league (repeatable)")
+    parser.add_argument("--min-90s", type=float, default=None,
+                        help=f"only candidates with at least this many '{MINUTES_COLUMN}'")
+    parser.add_argument("--data", default=None, help="Parquet directory or CSV file (default: as Query.py)")
+    parser.add_argument("--index", default=None, help="index file (default: next to the data, .similarity.npz)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if the dataset hasn't changed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    index = SimilarityIndex.open(args.data, args.index, args.rebuild)
+
+    start = time.perf_counter()
+    try:
+        result = index.similar_players(args.player, args.k, args.team, tiers=args.tiers,
+                                       leagues=args.leagues, min_90s=args.min_90s)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.max_columns', None, 'display.width', None):
+        print(result.to_string(index=False))
+    print(f"\n⏱️  {len(result)} players out of {len(index):,} in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
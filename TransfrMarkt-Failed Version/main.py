@@ -1,4 +1,8 @@
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
@@ -8,12 +12,62 @@ import csv
 from datetime import datetime
 
 
+# Connections kept open per host; raise it when requesting from several threads
+DEFAULT_POOL_SIZE = 4
+# Seconds to wait for a connection and for each read of a response
+REQUEST_TIMEOUT = (10, 30)
+
+# Rate limiting (429) and transient server/gateway errors are retried, as are
+# dropped connections and timeouts, after an exponential, jittered pause or the
+# server's Retry-After (capped at BACKOFF_MAX, like the backoff itself)
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 2
+BACKOFF_JITTER = 1.0
+BACKOFF_MAX = 120
+
+# Shared sessions by pool size
+_http_sessions = {}
+
+
+class CappedRetry(Retry):
+    """Retry that waits at most BACKOFF_MAX for a Retry-After, and backs off as usual when it is malformed"""
+
+    def parse_retry_after(self, retry_after):
+        try:
+            return min(super().parse_retry_after(retry_after), BACKOFF_MAX)
+        except InvalidHeader:
+            return None
+
+
+def get_http_session(pool_size=DEFAULT_POOL_SIZE):
+    """
+    Return the shared requests session with `pool_size` connections per host,
+    creating it on first use. Connections are kept alive, responses are
+    gzip-compressed, and failed requests are retried with backoff (honouring Retry-After).
+    """
+    if pool_size not in _http_sessions:
+        retry = CappedRetry(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, backoff_jitter=BACKOFF_JITTER,
+                            backoff_max=BACKOFF_MAX, status_forcelist=RETRY_STATUSES, allowed_methods=["GET"],
+                            respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_sessions[pool_size] = session
+
+    return _http_sessions[pool_size]
+
+
 class TransfermarktScraper:
-    def __init__(self):
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.session = get_http_session(pool_size)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0'
@@ -21,10 +75,14 @@ class TransfermarktScraper:
         self.base_url = "https://www.transfermarkt.com"
 
     def get_soup(self, url):
-        """Make request and return BeautifulSoup object."""
+        """Make request and return BeautifulSoup object (None once the retries are used up)."""
         try:
             print(f"Requesting URL: {url}")
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers, timeout=REQUEST_TIMEOUT)
+            retries = getattr(response.raw, 'retries', None)
+            if retries is not None and retries.history:
+                print(f"Retried {len(retries.history)} time(s): "
+                      f"{', '.join(str(attempt.status or attempt.error) for attempt in retries.history)}")
             response.raise_for_status()
             print(f"Request successful (status code: {response.status_code})")
             return BeautifulSoup(response.text, 'html.parser')
@@ -432,7 +490,12 @@ class TransfermarktScraper:
 
 """
 def main():
-    scraper = TransfermarktScraper()
+    parser = argparse.ArgumentParser(description="Scrape player data from Transfermarkt")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"connections kept open per host (default: {DEFAULT_POOL_SIZE})")
+    args = parser.parse_args()
+
+    scraper = TransfermarktScraper(pool_size=args.pool_size)
 
     print("Transfermarkt Player Scraper")
     print("---------------------------")
@@ -0,0 +1,283 @@
+"""
+Offline benchmark of the FBRef parsers in Scraper.py.
+
+Runs the league stats-table parser and the competitions-page parser against the
+saved HTML in benchmarks/fixtures/ - the small league page as saved, plus Tier 1-
+sized and 10x-sized synthetic pages built by repeating its player rows - and reports
+rows/sec, peak memory and per-stage timings as JSON. Results can be compared with a
+stored baseline to catch regressions. Timings depend on the machine, so no baseline
+is committed: save one locally with --save-baseline (benchmarks/baseline.json, which
+git ignores) before changing the parsers. Nothing here touches the network except
+--record, which saves a live page as a new fixture.
+
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --save-baseline
+    python benchmarks/bench_parsers.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_parsers.py --record https://fbref.com/en/comps/9/stats/Premier-League-Stats league_premier_league.html
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import lxml
+import lxml.html
+import pandas as pd
+from bs4 import BeautifulSoup
+
+import Scraper
+from Dataset import apply_schema, clean_league_frame
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = "bench_results.json"
+
+# Copies of the small fixture's player rows in the synthetic pages: ~600 rows is
+# the size of a Tier 1 league table, and 10x that stresses the parser
+LEAGUE_CASES = [
+    ('league_small', 'league_stats.html', 1),
+    ('league_tier1', 'league_stats.html', 20),
+    ('league_10x', 'league_stats.html', 200),
+]
+COMPETITIONS_CASES = [
+    ('competitions', 'competitions.html', 1),
+]
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def scale_league_page(page_source, factor):
+    """Repeat the player rows of the stats table `factor` times"""
+    if factor == 1:
+        return page_source
+
+    table_start = page_source.index('id="stats_standard"')
+    body_start = page_source.index('<tbody>', table_start) + len('<tbody>')
+    body_end = page_source.index('</tbody>', body_start)
+    return page_source[:body_start] + page_source[body_start:body_end] * factor + page_source[body_end:]
+
+
+def league_stages(page_source):
+    """The stages of Scraper.parse_league_page (as a refresh runs it, with the fingerprint), one at a time"""
+    root = lxml.html.fromstring(page_source, parser=Scraper.HTML_PARSER)
+    yield 'html_parse'
+    table = Scraper.find_stats_table(root)
+    yield 'find_table'
+    Scraper.table_fingerprint(table)
+    yield 'fingerprint'
+    df = Scraper.extract_stats_table(table)
+    yield 'extract'
+    df = clean_league_frame(df)
+    yield 'clean'
+    apply_schema(df)
+    yield 'coerce'
+
+
+def competitions_stages(page_source):
+    BeautifulSoup(page_source, 'html.parser')
+    yield 'html_parse'
+
+
+def time_stages(stages, page_source):
+    """Seconds spent in each stage of one run"""
+    timings = {}
+    start = time.perf_counter()
+    for stage in stages(page_source):
+        now = time.perf_counter()
+        timings[stage] = now - start
+        start = now
+    return timings
+
+
+def peak_memory(parse, page_source):
+    """Peak bytes allocated by Python while parsing the page once"""
+    tracemalloc.start()
+    try:
+        parse(page_source)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(name, page_source, parse, stages, count_rows, repeat):
+    """
+    Benchmark one fixture: best stage and end-to-end timings over `repeat` runs.
+    The fastest run is the one least disturbed by the rest of the machine, so it
+    is the steadiest number to compare between runs.
+    """
+    # Parsers report what they find with print(); keep the benchmark output clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = count_rows(parse(page_source))
+
+        stage_runs = [time_stages(stages, page_source) for _ in range(repeat)]
+        totals = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(page_source)
+            totals.append(time.perf_counter() - start)
+
+        peak = peak_memory(parse, page_source)
+
+    total = min(totals)
+    stage_timings = {stage: min(run[stage] for run in stage_runs) for stage in stage_runs[0]}
+    stage_timings['end_to_end'] = total
+
+    return {
+        'rows': rows,
+        'bytes': len(page_source.encode('utf-8')),
+        'rows_per_sec': rows / total if total else None,
+        'peak_memory_bytes': peak,
+        'stages': stage_timings,
+    }
+
+
+def run_benchmarks(repeat):
+    results = {}
+
+    for name, fixture, factor in LEAGUE_CASES:
+        print(f"⏱️  {name} ...")
+        page_source = scale_league_page(read_fixture(fixture), factor)
+        results[name] = run_case(name, page_source,
+                                 lambda page: Scraper.parse_league_page(page, name, record_fingerprint=True),
+                                 league_stages,
+                                 lambda df: 0 if df is None else len(df),
+                                 repeat)
+
+    for name, fixture, factor in COMPETITIONS_CASES:
+        print(f"⏱️  {name} ...")
+        page_source = read_fixture(fixture)
+        results[name] = run_case(name, page_source,
+                                 Scraper.parse_competitions_page,
+                                 competitions_stages,
+                                 lambda leagues: sum(len(tier) for tier in leagues.values()),
+                                 repeat)
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'lxml': lxml.__version__,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold, min_delta):
+    """
+    Print stage timings against the baseline; returns the regressions found.
+    A stage only regresses when it is both `threshold` slower and `min_delta`
+    seconds slower, so jitter on millisecond-sized stages is not reported.
+    """
+    regressions = []
+
+    print(f"\n📊 Compared with baseline from {baseline['meta'].get('created_at', '?')} "
+          f"(regression = more than {threshold:.0%} slower)")
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"  {name}: not in baseline")
+            continue
+
+        for stage, seconds in current['stages'].items():
+            before = previous['stages'].get(stage)
+            if not before:
+                continue
+            change = seconds / before - 1
+            regressed = change > threshold and seconds - before > min_delta
+            flag = "❌" if regressed else "✅"
+            print(f"  {flag} {name:14s} {stage:12s} {before * 1000:9.2f} ms -> {seconds * 1000:9.2f} ms ({change:+.0%})")
+            if regressed:
+                regressions.append((name, stage, change))
+
+    return regressions
+
+
+def record_fixture(url, name):
+    """Save a live page (server HTML, no browser) as a fixture"""
+    Scraper.PAGE_CACHE = None
+    page_source = Scraper.fetch_page_http(url)
+    path = os.path.join(FIXTURES_DIR, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page_source)
+    print(f"💾 Saved {len(page_source):,} characters from {url} to {path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of the FBRef page parsers")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per fixture; the best run is reported (default: 5)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help=f"where to write the JSON results (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--baseline", nargs='?', const=DEFAULT_BASELINE,
+                        help=f"compare with a stored baseline (default file: {DEFAULT_BASELINE}); "
+                             "exits with status 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown of a stage that counts as a regression (default: 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5,
+                        help="ignore slowdowns smaller than this many milliseconds (default: 5)")
+    parser.add_argument("--save-baseline", nargs='?', const=DEFAULT_BASELINE,
+                        help=f"store these results as the baseline (default file: {DEFAULT_BASELINE})")
+    parser.add_argument("--record", nargs=2, metavar=('URL', 'NAME'),
+                        help="download URL into fixtures/NAME instead of benchmarking")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.record:
+        record_fixture(*args.record)
+        return 0
+
+    print("🏁 FBREF PARSER BENCHMARK")
+    print("=" * 60)
+    results = run_benchmarks(max(1, args.repeat))
+
+    print("\n" + "=" * 60)
+    for name, result in results['results'].items():
+        print(f"{name:14s} {result['rows']:6,} rows  {result['bytes'] / 1024:9,.0f} KiB  "
+              f"{result['stages']['end_to_end'] * 1000:9.2f} ms  "
+              f"{result['rows_per_sec'] or 0:10,.0f} rows/s  "
+              f"peak {result['peak_memory_bytes'] / 2 ** 20:7.1f} MiB")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {args.output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline}; save one on this machine first with --save-baseline")
+            return 1
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) regressed")
+            return 1
+        print("\n✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
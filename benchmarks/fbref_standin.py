@@ -0,0 +1,249 @@
+"""
+Local stand-in for fbref.com, for end-to-end load tests of Scraper.py.
+
+Serves the saved pages in benchmarks/fixtures/ under FBRef's URLs - the
+competitions page at /en/comps/, a league page for every
+/en/comps/[<season>/]<category>/<name>-Stats and a history page listing the
+seasons of every /en/comps/<id>/history/<name>-Seasons - and can misbehave like the real site under
+load: added latency, 429 (with Retry-After) and 503 responses, a per-minute
+request limit, bodies that trickle in slowly and bodies cut off half way.
+Point the scraper at it with --base-url and measure leagues/min, retries and
+concurrency limits without sending a single request to FBRef:
+
+    python benchmarks/fbref_standin.py --port 8000 --latency 0.2 --error-rate 0.05
+    python Scraper.py --base-url http://127.0.0.1:8000 --no-cache --requests-per-minute 600
+
+A league's standard stats page is read from fixtures/comp_<id>.html when that file
+exists (see bench_parsers.py --record) and from fixtures/league_stats.html
+otherwise; its other stats categories (shooting, keepers, ...) likewise from
+comp_<id>_<category>.html or league_<category>.html, and are 404 when neither exists.
+Past seasons are served the same pages as the current one. History pages are
+fixtures/league_history.html with the competition filled in.
+GET /__stats returns the requests served so far as JSON; the same counts are
+printed when the server stops.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+COMPETITIONS_PATH = re.compile(r'^/en/comps/?$')
+LEAGUE_PATH = re.compile(r'^/en/comps/(\d+)/(?:\d{4}(?:-\d{4})?/)?(?:(\w+)/)?[^/]*-Stats$')
+HISTORY_PATH = re.compile(r'^/en/comps/(\d+)/history/([^/]+)-Seasons$')
+
+
+class StandinServer(ThreadingHTTPServer):
+    """HTTP server holding the fault settings and the running request counts"""
+
+    daemon_threads = True
+
+    def __init__(self, address, args):
+        super().__init__(address, StandinHandler)
+        self.args = args
+        self.pages_dir = args.pages_dir
+        self.counts = Counter()
+        self.started = time.monotonic()
+        self._recent = deque()
+        self._random = random.Random(args.seed)
+        self._lock = threading.Lock()
+
+    def read_page(self, name):
+        with open(os.path.join(self.pages_dir, name), 'rb') as f:
+            return f.read()
+
+    def league_page(self, comp_id, category=None):
+        """A league's page for a stats category, or None when there is no fixture for it"""
+        category = category or 'stats'
+        names = [f"comp_{comp_id}.html" if category == 'stats' else f"comp_{comp_id}_{category}.html",
+                 f"league_{category}.html"]
+        for name in names:
+            if os.path.exists(os.path.join(self.pages_dir, name)):
+                return self.read_page(name)
+        return None
+
+    def history_page(self, comp_id, name):
+        """A competition's history page, from the template with its id and name filled in"""
+        page = self.read_page('league_history.html').decode('utf-8')
+        for placeholder, value in [('__COMP_ID__', comp_id), ('__NAME__', name), ('__TITLE__', name.replace('-', ' '))]:
+            page = page.replace(placeholder, value)
+        return page.encode('utf-8')
+
+    def choose_fault(self):
+        """
+        Decide how to answer the next request: None for a normal response, or
+        '429', '503', 'slow' or 'truncate'. Requests over --rate-limit in the last
+        minute are always answered with 429, like FBRef's own limiter.
+        """
+        args = self.args
+        with self._lock:
+            now = time.monotonic()
+            if args.rate_limit:
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= args.rate_limit:
+                    return '429'
+                self._recent.append(now)
+
+            roll = self._random.random()
+            for fault, rate in [('429', args.error_rate), ('503', args.unavailable_rate),
+                                ('slow', args.slow_rate), ('truncate', args.truncate_rate)]:
+                if roll < rate:
+                    return fault
+                roll -= rate
+            return None
+
+    def delay(self):
+        with self._lock:
+            jitter = self._random.uniform(-self.args.jitter, self.args.jitter)
+        return max(0.0, self.args.latency + jitter)
+
+    def count(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'elapsed_seconds': round(elapsed, 3),
+                'requests': sum(self.counts.values()),
+                'requests_per_minute': round(sum(self.counts.values()) / elapsed * 60, 1) if elapsed else None,
+                'outcomes': dict(self.counts),
+            }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "FBRefStandin/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+
+        if path == '/__stats':
+            self.send_body(200, json.dumps(self.server.stats(), indent=2).encode('utf-8'), 'application/json')
+            return
+
+        if COMPETITIONS_PATH.match(path):
+            page = self.server.read_page('competitions.html')
+        elif HISTORY_PATH.match(path):
+            page = self.server.history_page(*HISTORY_PATH.match(path).groups())
+        else:
+            match = LEAGUE_PATH.match(path)
+            page = self.server.league_page(*match.groups()) if match else None
+            if page is None:
+                self.server.count('404')
+                self.send_body(404, b"Not Found", 'text/plain')
+                return
+
+        time.sleep(self.server.delay())
+
+        fault = self.server.choose_fault()
+        self.server.count(fault or '200')
+
+        if fault == '429':
+            self.send_body(429, b"Too Many Requests", 'text/plain',
+                           {'Retry-After': str(self.server.args.retry_after)})
+        elif fault == '503':
+            self.send_body(503, b"Service Unavailable", 'text/plain')
+        elif fault == 'slow':
+            self.send_slowly(page)
+        elif fault == 'truncate':
+            self.send_truncated(page)
+        else:
+            self.send_body(200, page)
+
+    def send_headers(self, status, length, content_type='text/html; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        self.send_headers(status, len(body), content_type, headers)
+        self.wfile.write(body)
+
+    def send_slowly(self, body, chunks=20):
+        """Send the page in pieces spread over --slow-seconds"""
+        self.send_headers(200, len(body))
+        step = -(-len(body) // chunks)
+        pause = self.server.args.slow_seconds / chunks
+        for start in range(0, len(body), step):
+            self.wfile.write(body[start:start + step])
+            self.wfile.flush()
+            time.sleep(pause)
+
+    def send_truncated(self, body):
+        """Announce the full page, send half of it and drop the connection"""
+        self.send_headers(200, len(body))
+        self.wfile.write(body[:len(body) // 2])
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        if self.server.args.verbose:
+            super().log_message(format, *args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for fbref.com with injectable faults")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument("--pages-dir", default=FIXTURES_DIR,
+                        help=f"directory of the recorded pages (default: {FIXTURES_DIR})")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added before every response (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="random +/- seconds around --latency (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests answered with 429 (default: 0)")
+    parser.add_argument("--retry-after", type=int, default=1,
+                        help="Retry-After sent with a 429, in whole seconds as the header requires (default: 1)")
+    parser.add_argument("--unavailable-rate", type=float, default=0.0,
+                        help="share of requests answered with 503 (default: 0)")
+    parser.add_argument("--slow-rate", type=float, default=0.0,
+                        help="share of pages sent slowly over --slow-seconds (default: 0)")
+    parser.add_argument("--slow-seconds", type=float, default=5.0,
+                        help="time taken to send a slow page (default: 5)")
+    parser.add_argument("--truncate-rate", type=float, default=0.0,
+                        help="share of pages cut off half way (default: 0)")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="requests per minute served before answering 429 (default: 0 = no limit)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the fault injection")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    server = StandinServer((args.host, args.port), args)
+    print(f"🏟️  FBRef stand-in serving {args.pages_dir} on http://{args.host}:{server.server_port}")
+    print(f"   latency {args.latency}s ±{args.jitter}s, 429 {args.error_rate:.0%}, 503 {args.unavailable_rate:.0%}, "
+          f"slow {args.slow_rate:.0%}, truncated {args.truncate_rate:.0%}, "
+          f"rate limit {args.rate_limit or 'none'}/min")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\n📊 Requests served:")
+        print(json.dumps(server.stats(), indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())